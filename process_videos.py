@@ -420,8 +420,8 @@ class VideoProcessor:
         self._update_heartbeat()
 
         # Mark as processing and set initial status
-        if self.db.is_processed(video['id']):
-            existing = self.db.get_video_by_id(video['id'])
+        existing = self.db.get_video_by_id(video['id'])
+        if existing:
             current_retry = existing.get('retry_count', 0)
             self.db.update_video_processing(
                 video['id'],
@@ -614,10 +614,13 @@ class VideoProcessor:
                     self.logger.info(f"   📭 No new videos")
                     continue
 
+                # Check database status for all candidates in one query
+                unprocessed_ids = self.db.filter_unprocessed([v['id'] for v in videos])
+
                 # Process each video
                 for video in videos:
                     # Check database status first - skip if already processed
-                    if self.db.is_processed(video['id']):
+                    if video['id'] not in unprocessed_ids:
                         existing = self.db.get_video_by_id(video['id'])
                         if existing and existing.get('processing_status') not in [STATUS_PENDING, None]:
                             self.logger.debug(f"   Skipping {existing.get('processing_status')}: {video['title'][:40]}")
@@ -17,17 +17,20 @@ class ConfigManager:
     No file operations - everything in SQLite!
     """
 
-    def __init__(self, config_path='config.txt', db_path='data/videos.db'):
+    def __init__(self, config_path='config.txt', db_path='data/videos.db', db=None):
         """
         Initialize ConfigManager.
 
         Args:
             config_path: Unused, kept for backward compatibility
             db_path: Path to SQLite database
+            db: Optional existing VideoDatabase to share (db_path is then ignored)
         """
-        # Import here to avoid circular dependency
-        from src.managers.database import VideoDatabase
-        self.db = VideoDatabase(db_path)
+        if db is None:
+            # Import here to avoid circular dependency
+            from src.managers.database import VideoDatabase
+            db = VideoDatabase(db_path)
+        self.db = db
 
     # ========================
     # Channels
@@ -97,9 +100,18 @@ class ConfigManager:
     # AI Prompt Template
     # ========================
 
-    def get_prompt(self) -> str:
-        """Get the current AI prompt template from database."""
-        return self.db.get_setting('ai_prompt_template') or self._get_default_prompt()
+    def get_prompt(self, db_settings: Optional[Dict[str, Dict[str, str]]] = None) -> str:
+        """
+        Get the current AI prompt template from database.
+
+        Args:
+            db_settings: Optional pre-read VideoDatabase.get_all_settings() result
+        """
+        if db_settings is not None:
+            prompt = db_settings.get('ai_prompt_template', {}).get('value')
+        else:
+            prompt = self.db.get_setting('ai_prompt_template')
+        return prompt or self._get_default_prompt()
 
     def set_prompt(self, prompt: str) -> bool:
         """
@@ -140,14 +152,18 @@ Transcript: {transcript}"""
     # Settings
     # ========================
 
-    def get_settings(self) -> Dict[str, str]:
+    def get_settings(self, db_settings: Optional[Dict[str, Dict[str, str]]] = None) -> Dict[str, str]:
         """
         Get all settings from database.
 
+        Args:
+            db_settings: Optional pre-read VideoDatabase.get_all_settings() result
+
         Returns:
             Dict mapping setting key to value
         """
-        db_settings = self.db.get_all_settings()
+        if db_settings is None:
+            db_settings = self.db.get_all_settings()
         # Convert to simple key-value dict for backward compatibility
         return {key: info['value'] for key, info in db_settings.items()}
 
@@ -217,14 +233,7 @@ Transcript: {transcript}"""
         Returns:
             List of channel dicts with channel_id, channel_name
         """
-        channels = self.db.get_all_channels()
-        return [
-            {
-                'channel_id': ch['channel_id'],
-                'channel_name': ch['channel_name']
-            }
-            for ch in channels
-        ]
+        return self.db.export_channels()
 
     def reset_all_settings(self) -> bool:
         """
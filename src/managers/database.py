@@ -4,11 +4,17 @@ SQLite Database Manager for YouTube Summarizer
 Tracks processed videos with metadata for stats and feed
 """
 
+import atexit
+import queue
+import re
 import sqlite3
 import os
-from typing import List, Dict, Optional, Tuple, Any
+import threading
+import time
+from typing import List, Dict, Iterator, Optional, Tuple, Any
 from datetime import datetime, timedelta
 from contextlib import contextmanager
+from operator import itemgetter
 
 from src.utils.formatters import format_duration, format_views, format_upload_date, format_processed_date
 
@@ -16,69 +22,253 @@ from src.utils.formatters import format_duration, format_views, format_upload_da
 class VideoDatabase:
     """SQLite database for tracking processed videos"""
 
+    # Max bound parameters per statement (SQLite's default SQLITE_MAX_VARIABLE_NUMBER is 999)
+    MAX_SQL_VARIABLES = 900
+
+    # Schema version stored in PRAGMA user_version; bump it whenever _init_db
+    # or a migration changes, since current databases skip the whole setup
+    # 1: small TEXT-keyed tables rebuilt as WITHOUT ROWID
+    # 2: counters table, channel_display_name column
+    # 3: idx_channels_enabled_name
+    # 4: auto_vacuum=INCREMENTAL conversion (now checked on every startup,
+    #    see _migrate_incremental_vacuum)
+    # 5: change-stamp counters and triggers for videos/channels/settings
+    SCHEMA_VERSION = 5
+
+    # Share of free pages at which a database not yet in auto_vacuum=INCREMENTAL
+    # mode is rebuilt with VACUUM at startup
+    VACUUM_FREE_PAGE_RATIO = 0.25
+
+    # Tables whose row writes are counted in counters as '<table>_changes'
+    CHANGE_STAMP_TABLES = ('videos', 'channels', 'settings')
+
+    # Tables stored WITHOUT ROWID (TEXT primary key, small rows). videos stays a
+    # rowid table: its summary_text rows are far larger than the ~1/20 page size
+    # SQLite recommends for WITHOUT ROWID tables.
+    WITHOUT_ROWID_TABLES = ('settings', 'channels', 'transcript_cache', 'counters', 'channel_stats_cache')
+
+    # Column order expected by _video_row_to_dict (migrations guarantee all exist)
+    VIDEO_COLUMNS = (
+        "id, channel_id, channel_display_name, title, duration_seconds, view_count, "
+        "upload_date, processed_date, processing_status, error_message, email_sent, "
+        "source_type, retry_count, transcript_source"
+    )
+    VIDEO_SUMMARY_COLUMNS = "summary_text, summary_length"
+
+    # Computed export fields (H:MM:SS / M:SS duration, hours saved at 80% of
+    # watch time, watch/channel URLs)
+    EXPORT_DERIVED_COLUMNS = """,
+        CASE WHEN COALESCE(duration_seconds, 0) >= 3600
+            THEN printf('%d:%02d:%02d', duration_seconds / 3600, duration_seconds / 60 % 60, duration_seconds % 60)
+            ELSE printf('%d:%02d', COALESCE(duration_seconds, 0) / 60, COALESCE(duration_seconds, 0) % 60)
+        END AS duration_formatted,
+        ROUND(COALESCE(duration_seconds, 0) * 0.8 / 3600, 2) AS hours_saved,
+        CASE WHEN id != '' THEN 'https://youtube.com/watch?v=' || id ELSE '' END AS youtube_url,
+        CASE WHEN channel_id != '' THEN 'https://youtube.com/channel/' || channel_id ELSE '' END AS channel_url
+    """
+
+    # Import record keys in videos-table column order for bulk_insert_videos
+    # (email_sent bools bind natively as 0/1)
+    BULK_INSERT_FIELDS = (
+        'video_id', 'channel_id', 'channel_name', 'title', 'duration_seconds', 'view_count',
+        'upload_date', 'summary_length', 'summary_text', 'processing_status',
+        'error_message', 'email_sent', 'source_type', 'transcript_source', 'processed_date', 'created_at',
+    )
+    _BULK_INSERT_EXTRACT = itemgetter(*BULK_INSERT_FIELDS)
+    _BULK_INSERT_DEFAULTS = {
+        'channel_id': '',
+        'title': '',
+        'processing_status': 'pending',
+        'email_sent': False,
+        'source_type': 'via_channel',
+    }
+    _BULK_INSERT_SQL = """
+        INSERT INTO videos
+        (id, channel_id, channel_name, title, duration_seconds, view_count,
+         upload_date, summary_length, summary_text, processing_status,
+         error_message, email_sent, source_type, transcript_source, processed_date, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _BULK_INSERT_SKIP_DUPLICATES_SQL = _BULK_INSERT_SQL.rstrip() + " ON CONFLICT(id) DO NOTHING"
+    # Row positions of the NOT NULL columns besides id (channel_id, title)
+    _BULK_INSERT_NOT_NULL = (BULK_INSERT_FIELDS.index('channel_id'), BULK_INSERT_FIELDS.index('title'))
+
+    # Idle connections kept per database file (extra ones are closed on release)
+    POOL_SIZE = 8
+
+    # Prepared statements kept per pooled connection (sqlite3 default is 128).
+    # Covers every fixed statement in this class plus the dynamic variants
+    # (IN-list sizes, listing filters) so hot statements are never re-parsed.
+    STATEMENT_CACHE_SIZE = 512
+
+    # Process-wide connection pools shared by all instances, keyed by (pid, db path)
+    _pools: Dict[Tuple[int, str], queue.LifoQueue] = {}
+    _pools_lock = threading.Lock()
+
     def __init__(self, db_path='data/videos.db'):
         self.db_path = db_path
 
         # Ensure data directory exists
         os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
 
+        # Shared pool key for this database file
+        self._cache_key = self._get_cache_key(db_path)
+        self._pool = self._get_pool(db_path)
+
         # Initialize database
         self._init_db()
 
-    @contextmanager
-    def _get_connection(self):
-        """Context manager for database connections"""
+    @staticmethod
+    def _get_cache_key(db_path: str) -> Tuple[int, str]:
+        """Key for process-wide shared state (connection pool) of a database file."""
+        # Include the pid so a forked child never reuses its parent's state
+        return (os.getpid(), os.path.abspath(db_path))
+
+    @classmethod
+    def _get_pool(cls, db_path: str) -> queue.LifoQueue:
+        """Return the process-wide connection pool for a database file."""
+        key = cls._get_cache_key(db_path)
+        with cls._pools_lock:
+            if key not in cls._pools:
+                cls._pools[key] = queue.LifoQueue(maxsize=cls.POOL_SIZE)
+            return cls._pools[key]
+
+    @classmethod
+    def close_all_connections(cls):
+        """Close every idle pooled connection (registered with atexit)."""
+        with cls._pools_lock:
+            for pool in cls._pools.values():
+                while True:
+                    try:
+                        pool.get_nowait().close()
+                    except queue.Empty:
+                        break
+
+    def _apply_pragmas(self):
+        """
+        Enable write-ahead logging (and incremental auto-vacuum for new files).
+
+        WAL lets readers (web UI) and the writer (processor) run concurrently
+        and, combined with synchronous=NORMAL, avoids a full fsync per commit.
+        """
         conn = sqlite3.connect(self.db_path)
+        try:
+            # Only takes effect on new databases (before the first table exists);
+            # existing files are converted by _migrate_incremental_vacuum
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new tuned connection for the pool."""
+        # Connections move between threads via the pool, but only one thread uses them at a time
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, cached_statements=self.STATEMENT_CACHE_SIZE
+        )
         conn.row_factory = sqlite3.Row  # Enable dict-like access
+
+        # Per-connection tuning (these settings are not persisted in the file)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
+        return conn
+
+    @contextmanager
+    def _get_connection(self):
+        """Context manager for pooled database connections"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
         try:
             yield conn
             conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
+        except BaseException:
+            # BaseException also covers GeneratorExit (an export iterator closed
+            # early) so no open transaction is ever returned to the pool
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                # Connection is unusable - drop it instead of returning it to the pool
+                conn.close()
+                conn = None
+            raise
         finally:
-            conn.close()
+            if conn is not None:
+                try:
+                    self._pool.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
 
     def _video_row_to_dict(self, row: sqlite3.Row, include_summary: bool = True) -> Dict[str, Any]:
         """
         Convert a SQLite row to a video dictionary with formatted fields.
 
         Args:
-            row: SQLite row from videos table
+            row: SQLite row selected with VIDEO_COLUMNS (plus VIDEO_SUMMARY_COLUMNS
+                when include_summary is True), in that order
             include_summary: Whether to include summary_text and summary_length
 
         Returns:
             Dict with video data and formatted fields
         """
+        # Positional unpacking avoids a name lookup per column on sqlite3.Row
+        (video_id, channel_id, channel_name, title, duration_seconds, view_count,
+         upload_date, processed_date, processing_status, error_message, email_sent,
+         source_type, retry_count, transcript_source) = row[:14]
+
         video = {
-            'id': row['id'],
-            'channel_id': row['channel_id'],
-            'channel_name': row['channel_name'] or row['channel_id'],
-            'title': row['title'],
-            'duration_seconds': row['duration_seconds'],
-            'duration_formatted': format_duration(row['duration_seconds']),
-            'view_count': row['view_count'],
-            'view_count_formatted': format_views(row['view_count']),
-            'upload_date': row['upload_date'],
-            'upload_date_formatted': format_upload_date(row['upload_date']),
-            'processed_date': row['processed_date'],
-            'processed_date_formatted': format_processed_date(row['processed_date']),
-            'processing_status': row['processing_status'],
-            'error_message': row['error_message'],
-            'email_sent': bool(row['email_sent']),
-            'source_type': row['source_type'] if 'source_type' in row.keys() else 'via_channel',
-            'retry_count': row['retry_count'] if 'retry_count' in row.keys() else 0,
-            'transcript_source': row['transcript_source'] if 'transcript_source' in row.keys() else None
+            'id': video_id,
+            'channel_id': channel_id,
+            'channel_name': channel_name,
+            'title': title,
+            'duration_seconds': duration_seconds,
+            'duration_formatted': format_duration(duration_seconds),
+            'view_count': view_count,
+            'view_count_formatted': format_views(view_count),
+            'upload_date': upload_date,
+            'upload_date_formatted': format_upload_date(upload_date),
+            'processed_date': processed_date,
+            'processed_date_formatted': format_processed_date(processed_date),
+            'processing_status': processing_status,
+            'error_message': error_message,
+            'email_sent': bool(email_sent),
+            'source_type': source_type,
+            'retry_count': retry_count,
+            'transcript_source': transcript_source
         }
 
         if include_summary:
-            video['summary_text'] = row['summary_text']
-            video['summary_length'] = row['summary_length']
+            video['summary_text'] = row[14]
+            video['summary_length'] = row[15]
 
         return video
 
     def _init_db(self):
-        """Initialize database schema"""
+        """
+        Initialize database schema
+
+        A database already at SCHEMA_VERSION is fully set up, so the common
+        case is two PRAGMA reads (user_version, auto_vacuum). Otherwise every CREATE ...
+        IF NOT EXISTS and migration runs (all idempotent) and the version is
+        recorded at the end.
+        """
+        with self._get_connection() as conn:
+            schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+        if auto_vacuum != 2:
+            self._migrate_incremental_vacuum()
+
+        if schema_version >= self.SCHEMA_VERSION:
+            return
+
+        # Switch to WAL journaling (persistent, stored in the database file)
+        self._apply_pragmas()
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
@@ -115,9 +305,44 @@ class VideoDatabase:
                 ON videos(processed_date DESC)
             """)
 
+            # Listing indexes matching get_processed_videos' ORDER BY exactly,
+            # so paginated feeds walk the index instead of sorting the table
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_videos_listing
+                ON videos(channel_id, (upload_date IS NULL), upload_date DESC, processed_date DESC)
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_videos_listing_global
+                ON videos((upload_date IS NULL), upload_date DESC, processed_date DESC)
+            """)
+
+            # Partial indexes for the rare "work to do" states instead of a
+            # full processing_status index dominated by 'success' rows
+            cursor.execute("DROP INDEX IF EXISTS idx_processing_status")
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_pending
+                ON videos(created_at)
+                WHERE processing_status = 'pending'
+            """)
+
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_processing_status
+                CREATE INDEX IF NOT EXISTS idx_in_progress
                 ON videos(processing_status)
+                WHERE processing_status IN (
+                    'processing',
+                    'fetching_metadata',
+                    'fetching_transcript',
+                    'generating_summary',
+                    'sending_email'
+                )
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_unsent
+                ON videos(id)
+                WHERE email_sent = 0 AND processing_status = 'success'
             """)
 
             conn.commit()
@@ -127,10 +352,47 @@ class VideoDatabase:
         self._migrate_add_source_type()
         self._migrate_add_transcript_source()
         self._migrate_add_retry_count()
+        self._migrate_add_channel_display_name()
         self._ensure_settings_table()
         self._ensure_channels_table()
         self._ensure_transcript_cache_table()
+        self._ensure_counters_table()
+        self._ensure_channel_stats_cache_table()
         self._migrate_decrypt_settings()  # Migrate from encrypted to plain text storage
+        if schema_version < 1:
+            self._migrate_without_rowid()
+
+        with self._get_connection() as conn:
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _migrate_incremental_vacuum(self):
+        """
+        Migration: Switch an existing database to auto_vacuum=INCREMENTAL
+
+        auto_vacuum only takes effect on new files or through a VACUUM, which
+        rebuilds the whole file while holding the write lock. Older databases
+        are therefore only converted at startup once VACUUM_FREE_PAGE_RATIO of
+        their pages are free (e.g. after reset_all_data), when the rebuild
+        actually returns space; until then they are left as they are.
+        Afterwards reset_all_data only needs the cheap PRAGMA incremental_vacuum.
+        """
+        # Dedicated connection: VACUUM cannot run inside a transaction
+        conn = sqlite3.connect(self.db_path)
+        try:
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not page_count or free_pages < page_count * self.VACUUM_FREE_PAGE_RATIO:
+                return
+
+            print(f"🔄 Converting database to incremental auto-vacuum ({free_pages}/{page_count} pages free)...")
+            started = time.perf_counter()
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            print(f"✅ Database converted in {time.perf_counter() - started:.1f}s")
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not enable incremental auto-vacuum: {e}")
+        finally:
+            conn.close()
 
     def _migrate_add_source_type(self):
         """
@@ -229,6 +491,84 @@ class VideoDatabase:
 
                 conn.commit()
 
+    def _migrate_add_channel_display_name(self):
+        """
+        Migration: Add channel_display_name generated column to existing databases
+
+        Resolves the "channel_name, falling back to channel_id" display rule
+        inside SQLite so listing and export reads return it directly.
+        ALTER TABLE can only add VIRTUAL generated columns; the expression is
+        a single COALESCE evaluated as the row is read.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            # table_xinfo also lists generated (hidden) columns
+            cursor.execute("PRAGMA table_xinfo(videos)")
+            columns = [row[1] for row in cursor.fetchall()]
+
+            if 'channel_display_name' not in columns:
+                cursor.execute("""
+                    ALTER TABLE videos
+                    ADD COLUMN channel_display_name TEXT
+                    GENERATED ALWAYS AS (COALESCE(NULLIF(channel_name, ''), channel_id)) VIRTUAL
+                """)
+
+                conn.commit()
+
+    def _migrate_without_rowid(self):
+        """
+        Migration: Rebuild TEXT-keyed lookup tables as WITHOUT ROWID
+
+        Rowid tables with a TEXT PRIMARY KEY keep a separate index for the key,
+        so every lookup by key is two B-tree searches. WITHOUT ROWID stores the
+        rows in the primary key B-tree itself. Existing indexes and triggers are
+        recreated after the rebuild.
+
+        Only called for databases below schema version 1.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            # Rename without re-checking triggers on videos that reference these
+            # tables by name (they would fail to resolve while the table is dropped)
+            cursor.execute("PRAGMA legacy_alter_table = ON")
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+
+                for table in self.WITHOUT_ROWID_TABLES:
+                    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,))
+                    row = cursor.fetchone()
+                    if not row or 'WITHOUT ROWID' in row[0].upper():
+                        continue  # Missing or already rebuilt (new databases are created WITHOUT ROWID)
+
+                    # Keep dependent index/trigger definitions; DROP TABLE removes them
+                    cursor.execute("""
+                        SELECT sql FROM sqlite_master
+                        WHERE type IN ('index', 'trigger') AND tbl_name = ? AND sql IS NOT NULL
+                    """, (table,))
+                    dependent_sql = [r[0] for r in cursor.fetchall()]
+
+                    cursor.execute(f"PRAGMA table_info({table})")
+                    pk_column = next(r[1] for r in cursor.fetchall() if r[5] == 1)
+
+                    create_sql = re.sub(
+                        rf'^CREATE TABLE\s+"?{table}"?', f'CREATE TABLE {table}_new', row[0], count=1
+                    ) + ' WITHOUT ROWID'
+                    cursor.execute(create_sql)
+
+                    # WITHOUT ROWID enforces NOT NULL on the primary key
+                    cursor.execute(f"INSERT INTO {table}_new SELECT * FROM {table} WHERE {pk_column} IS NOT NULL")
+                    cursor.execute(f"DROP TABLE {table}")
+                    cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+                    for sql in dependent_sql:
+                        cursor.execute(sql)
+
+                conn.commit()
+            finally:
+                cursor.execute("PRAGMA legacy_alter_table = OFF")
+
     def _migrate_decrypt_settings(self):
         """
         Migration: Decrypt all encrypted settings and store as plain text.
@@ -328,7 +668,7 @@ class VideoDatabase:
                     description TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                ) WITHOUT ROWID
             """)
 
             # Check if we need to add encrypted column to existing table
@@ -382,7 +722,14 @@ class VideoDatabase:
                     enabled BOOLEAN DEFAULT 1,
                     added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                ) WITHOUT ROWID
+            """)
+
+            # Covers get_enabled_channels: range scan in channel_name order, no sort
+            # (channel_id is carried in every index entry of a WITHOUT ROWID table)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_channels_enabled_name
+                ON channels(enabled, channel_name, added_at)
             """)
 
             # Add config settings to settings table
@@ -412,7 +759,7 @@ class VideoDatabase:
                     status TEXT NOT NULL,
                     reason TEXT,
                     last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                ) WITHOUT ROWID
             """)
 
             cursor.execute("""
@@ -422,13 +769,215 @@ class VideoDatabase:
 
             conn.commit()
 
+    def _ensure_counters_table(self):
+        """
+        Ensure counters table and its maintenance triggers exist.
+
+        Holds a running 'videos_total' so the unfiltered pagination total is
+        a primary key lookup instead of COUNT(*). Per-channel totals live in
+        channel_stats_cache. Triggers fire inside each write transaction, so
+        the counter stays consistent with the videos table automatically.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            # Superseded by counters + channel_stats_cache
+            cursor.execute("DROP TRIGGER IF EXISTS video_counts_after_insert")
+            cursor.execute("DROP TRIGGER IF EXISTS video_counts_after_delete")
+            cursor.execute("DROP TRIGGER IF EXISTS video_counts_after_update_channel")
+            cursor.execute("DROP TABLE IF EXISTS video_counts")
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID
+            """)
+
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS counters_after_insert
+                AFTER INSERT ON videos
+                BEGIN
+                    UPDATE counters SET value = value + 1 WHERE name = 'videos_total';
+                END
+            """)
+
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS counters_after_delete
+                AFTER DELETE ON videos
+                BEGIN
+                    UPDATE counters SET value = value - 1 WHERE name = 'videos_total';
+                END
+            """)
+
+            # Existing database: seed the counter from current rows
+            cursor.execute("""
+                INSERT OR IGNORE INTO counters (name, value)
+                SELECT 'videos_total', COUNT(*) FROM videos
+            """)
+
+            # Change stamps for export validators (see get_change_stamps): every
+            # row write to an exported table bumps its '<table>_changes' counter
+            for table in self.CHANGE_STAMP_TABLES:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO counters (name, value) VALUES (?, 0)",
+                    (f"{table}_changes",),
+                )
+                for event in ("INSERT", "UPDATE", "DELETE"):
+                    cursor.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS {table}_changes_after_{event.lower()}
+                        AFTER {event} ON {table}
+                        BEGIN
+                            UPDATE counters SET value = value + 1 WHERE name = '{table}_changes';
+                        END
+                    """)
+
+            # Random per-database identity, so stamps of a recreated database
+            # never repeat those of the file it replaced
+            cursor.execute("""
+                INSERT OR IGNORE INTO counters (name, value)
+                VALUES ('database_epoch', ABS(RANDOM()))
+            """)
+
+            conn.commit()
+
+    def _ensure_channel_stats_cache_table(self):
+        """
+        Ensure channel_stats_cache table and its maintenance triggers exist.
+
+        Materializes per-channel aggregates (video count, total duration,
+        last processed date) so the dashboard reads O(channels) rows instead
+        of scanning all videos. Triggers keep the rows up to date inside each
+        write transaction.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='channel_stats_cache'")
+            needs_backfill = cursor.fetchone() is None
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS channel_stats_cache (
+                    channel_id TEXT PRIMARY KEY,
+                    total_videos INTEGER NOT NULL DEFAULT 0,
+                    total_duration INTEGER NOT NULL DEFAULT 0,
+                    last_processed TIMESTAMP
+                ) WITHOUT ROWID
+            """)
+
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS channel_stats_after_insert
+                AFTER INSERT ON videos
+                BEGIN
+                    INSERT INTO channel_stats_cache (channel_id, total_videos, total_duration, last_processed)
+                    VALUES (NEW.channel_id, 1, COALESCE(NEW.duration_seconds, 0), NEW.processed_date)
+                    ON CONFLICT(channel_id) DO UPDATE SET
+                        total_videos = total_videos + 1,
+                        total_duration = total_duration + excluded.total_duration,
+                        last_processed = MAX(
+                            COALESCE(last_processed, excluded.last_processed),
+                            COALESCE(excluded.last_processed, last_processed)
+                        );
+                END
+            """)
+
+            # Backs the MAX(processed_date) lookups below (O(log n) per channel)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_channel_processed
+                ON videos(channel_id, processed_date)
+            """)
+
+            # MAX() cannot be decremented, so last_processed is re-read via the index
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS channel_stats_after_delete
+                AFTER DELETE ON videos
+                BEGIN
+                    UPDATE channel_stats_cache SET
+                        total_videos = total_videos - 1,
+                        total_duration = total_duration - COALESCE(OLD.duration_seconds, 0),
+                        last_processed = (SELECT MAX(processed_date) FROM videos WHERE channel_id = OLD.channel_id)
+                    WHERE channel_id = OLD.channel_id;
+                    DELETE FROM channel_stats_cache
+                    WHERE channel_id = OLD.channel_id AND total_videos <= 0;
+                END
+            """)
+
+            # An update is applied as "remove OLD row, add NEW row"
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS channel_stats_after_update
+                AFTER UPDATE OF channel_id, duration_seconds, processed_date ON videos
+                BEGIN
+                    UPDATE channel_stats_cache SET
+                        total_videos = total_videos - 1,
+                        total_duration = total_duration - COALESCE(OLD.duration_seconds, 0)
+                    WHERE channel_id = OLD.channel_id;
+                    DELETE FROM channel_stats_cache
+                    WHERE channel_id = OLD.channel_id AND total_videos <= 0;
+                    UPDATE channel_stats_cache
+                    SET last_processed = (SELECT MAX(processed_date) FROM videos WHERE channel_id = OLD.channel_id)
+                    WHERE channel_id = OLD.channel_id;
+                    INSERT INTO channel_stats_cache (channel_id, total_videos, total_duration, last_processed)
+                    VALUES (NEW.channel_id, 1, COALESCE(NEW.duration_seconds, 0), NEW.processed_date)
+                    ON CONFLICT(channel_id) DO UPDATE SET
+                        total_videos = total_videos + 1,
+                        total_duration = total_duration + excluded.total_duration,
+                        last_processed = (SELECT MAX(processed_date) FROM videos WHERE channel_id = NEW.channel_id);
+                END
+            """)
+
+            if needs_backfill:
+                # Existing database: seed the cache from current rows
+                cursor.execute("""
+                    INSERT INTO channel_stats_cache (channel_id, total_videos, total_duration, last_processed)
+                    SELECT channel_id, COUNT(*), COALESCE(SUM(duration_seconds), 0), MAX(processed_date)
+                    FROM videos GROUP BY channel_id
+                """)
+
+            conn.commit()
+
     def is_processed(self, video_id: str) -> bool:
-        """Check if video has been processed"""
+        """
+        Check if video has been processed
+
+        Always probes the database: the web UI and the background processor
+        insert and delete videos independently, so no in-process cache can be
+        trusted. Batch callers should use filter_unprocessed().
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT 1 FROM videos WHERE id = ?", (video_id,))
             return cursor.fetchone() is not None
 
+    def filter_unprocessed(self, video_ids: List[str]) -> set:
+        """
+        Filter a list of video IDs down to those not yet in the database.
+
+        Uses one IN query per chunk instead of calling is_processed() per ID.
+
+        Args:
+            video_ids: Candidate YouTube video IDs
+
+        Returns:
+            Set of video IDs that are not in the videos table
+        """
+        candidates = set(video_ids)
+        if not candidates:
+            return set()
+
+        ids = list(candidates)
+        existing = set()
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            # Chunk to stay below SQLite's SQLITE_MAX_VARIABLE_NUMBER
+            for start in range(0, len(ids), self.MAX_SQL_VARIABLES):
+                chunk = ids[start:start + self.MAX_SQL_VARIABLES]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"SELECT id FROM videos WHERE id IN ({placeholders})", chunk)
+                existing.update(row[0] for row in cursor.fetchall())
+
+        return candidates - existing
+
     def add_video(
         self,
         video_id: str,
@@ -467,25 +1016,26 @@ class VideoDatabase:
 
         Returns:
             True if video was added successfully, False if already exists
+
+        Raises:
+            sqlite3.IntegrityError: If a required field (channel_id, title) is None
         """
-        if self.is_processed(video_id):
-            return False
+        # Single statement: the ON CONFLICT clause skips existing IDs only (no
+        # separate existence probe); other constraint violations such as a NULL
+        # channel_id or title still raise instead of silently dropping the row
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO videos
+                (id, channel_id, channel_name, title, duration_seconds, view_count, upload_date,
+                 summary_length, summary_text, processing_status, error_message, email_sent, source_type, transcript_source)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO NOTHING
+            """, (video_id, channel_id, channel_name, title, duration_seconds, view_count, upload_date,
+                  summary_length, summary_text, processing_status, error_message, int(email_sent), source_type, transcript_source))
+            added = cursor.rowcount == 1
 
-        try:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO videos
-                    (id, channel_id, channel_name, title, duration_seconds, view_count, upload_date,
-                     summary_length, summary_text, processing_status, error_message, email_sent, source_type, transcript_source)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (video_id, channel_id, channel_name, title, duration_seconds, view_count, upload_date,
-                      summary_length, summary_text, processing_status, error_message, int(email_sent), source_type, transcript_source))
-            return True
-        except sqlite3.IntegrityError:
-            # Video already exists (race condition between is_processed check and insert)
-            # This is safe to ignore - the database PRIMARY KEY constraint prevents duplicates
-            return False
+        return added
 
     def get_channel_stats(self, channel_id: str) -> Dict:
         """
@@ -501,18 +1051,15 @@ class VideoDatabase:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT
-                    COUNT(*) as total_videos,
-                    SUM(duration_seconds) as total_duration,
-                    MAX(processed_date) as last_processed
-                FROM videos
+                SELECT total_videos, total_duration, last_processed
+                FROM channel_stats_cache
                 WHERE channel_id = ?
             """, (channel_id,))
 
             row = cursor.fetchone()
 
-            total_videos = row['total_videos'] or 0
-            total_duration = row['total_duration'] or 0
+            total_videos = row['total_videos'] if row else 0
+            total_duration = row['total_duration'] if row else 0
 
             # Calculate total hours of video content
             total_hours = total_duration / 3600 if total_duration else 0
@@ -521,7 +1068,7 @@ class VideoDatabase:
                 'total_videos': total_videos,
                 'total_duration_seconds': total_duration,
                 'hours_saved': round(total_hours, 1),
-                'last_processed': row['last_processed']
+                'last_processed': row['last_processed'] if row else None
             }
 
     def get_all_channel_stats(self) -> Dict[str, Dict]:
@@ -532,14 +1079,10 @@ class VideoDatabase:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # Read the trigger-maintained aggregates: O(channels) instead of O(videos)
             cursor.execute("""
-                SELECT
-                    channel_id,
-                    COUNT(*) as total_videos,
-                    SUM(duration_seconds) as total_duration,
-                    MAX(processed_date) as last_processed
-                FROM videos
-                GROUP BY channel_id
+                SELECT channel_id, total_videos, total_duration, last_processed
+                FROM channel_stats_cache
             """)
 
             stats = {}
@@ -572,24 +1115,7 @@ class VideoDatabase:
             cursor = conn.cursor()
 
             # Build query
-            query = """
-                SELECT
-                    id,
-                    channel_id,
-                    channel_name,
-                    title,
-                    duration_seconds,
-                    view_count,
-                    upload_date,
-                    processed_date,
-                    processing_status,
-                    error_message,
-                    email_sent,
-                    source_type,
-                    retry_count,
-                    transcript_source
-                FROM videos
-            """
+            query = f"SELECT {self.VIDEO_COLUMNS} FROM videos"
 
             params = []
             where_clauses = []
@@ -611,13 +1137,13 @@ class VideoDatabase:
             # Order by
             if order_by == 'recent':
                 # Sort by upload_date (newest first), with NULL values last
-                # SQLite: use CASE to put NULLs at the end
-                query += " ORDER BY CASE WHEN upload_date IS NULL THEN 1 ELSE 0 END, upload_date DESC, processed_date DESC"
+                # (upload_date IS NULL) matches the idx_videos_listing* expression indexes
+                query += " ORDER BY (upload_date IS NULL), upload_date DESC, processed_date DESC"
             elif order_by == 'oldest':
                 # Sort by upload_date (oldest first), with NULL values last
-                query += " ORDER BY CASE WHEN upload_date IS NULL THEN 1 ELSE 0 END, upload_date ASC, processed_date ASC"
+                query += " ORDER BY (upload_date IS NULL), upload_date ASC, processed_date ASC"
             elif order_by == 'channel':
-                query += " ORDER BY channel_name, CASE WHEN upload_date IS NULL THEN 1 ELSE 0 END, upload_date DESC"
+                query += " ORDER BY channel_name, (upload_date IS NULL), upload_date DESC"
 
             # Pagination
             query += " LIMIT ? OFFSET ?"
@@ -631,11 +1157,41 @@ class VideoDatabase:
 
             return videos
 
+    def get_change_stamps(self) -> Tuple[Tuple[str, int], ...]:
+        """
+        Read the change stamps of the exported data in one query.
+
+        The '<table>_changes' counters are bumped by triggers on every row
+        insert, update and delete (from any process), so equal stamps mean the
+        videos, channels and settings are unchanged - regardless of file
+        mtimes, WAL checkpoints or timestamp resolution.
+
+        Returns:
+            Sorted (name, value) pairs from the counters table
+        """
+        with self._get_connection() as conn:
+            return tuple(
+                (row[0], row[1])
+                for row in conn.execute("SELECT name, value FROM counters ORDER BY name")
+            )
+
     def get_total_count(self, channel_id: Optional[str] = None, source_type: Optional[str] = None) -> int:
         """Get total count of processed videos (for pagination)"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # Unfiltered / channel-only counts come from trigger-maintained tables
+            if not source_type:
+                if channel_id:
+                    cursor.execute(
+                        "SELECT total_videos FROM channel_stats_cache WHERE channel_id = ?",
+                        (channel_id,)
+                    )
+                else:
+                    cursor.execute("SELECT value FROM counters WHERE name = 'videos_total'")
+                row = cursor.fetchone()
+                return row[0] if row else 0
+
             query = "SELECT COUNT(*) as count FROM videos"
             params = []
             where_clauses = []
@@ -661,12 +1217,13 @@ class VideoDatabase:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # Aggregate the per-channel cache rather than scanning all videos
             cursor.execute("""
                 SELECT
-                    COUNT(*) as total_videos,
-                    COUNT(DISTINCT channel_id) as total_channels,
-                    SUM(duration_seconds) as total_duration
-                FROM videos
+                    SUM(total_videos) as total_videos,
+                    COUNT(*) as total_channels,
+                    SUM(total_duration) as total_duration
+                FROM channel_stats_cache
             """)
 
             row = cursor.fetchone()
@@ -689,21 +1246,24 @@ class VideoDatabase:
         if not os.path.exists(txt_file_path):
             return 0
 
-        migrated = 0
-
         with open(txt_file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                video_id = line.strip()
-                if video_id:
-                    # Add with minimal data (no title/duration available)
-                    success = self.add_video(
-                        video_id=video_id,
-                        channel_id='unknown',
-                        title=f'Video {video_id}',
-                        channel_name='Unknown Channel'
-                    )
-                    if success:
-                        migrated += 1
+            video_ids = [line.strip() for line in f]
+
+        # Add with minimal data (no title/duration available)
+        rows = (
+            (video_id, 'unknown', 'Unknown Channel', f'Video {video_id}')
+            for video_id in video_ids if video_id
+        )
+
+        # One transaction for the whole file; OR IGNORE skips IDs already tracked
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany("""
+                INSERT OR IGNORE INTO videos (id, channel_id, channel_name, title)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            migrated = max(cursor.rowcount, 0)
 
         return migrated
 
@@ -725,41 +1285,27 @@ class VideoDatabase:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            # Build update query dynamically based on provided fields
-            updates = ['processing_status = ?']
-            params = [status]
-
-            if summary_text is not None:
-                updates.append('summary_text = ?')
-                params.append(summary_text)
-
-            if summary_length is not None:
-                updates.append('summary_length = ?')
-                params.append(summary_length)
-
-            if error_message is not None:
-                updates.append('error_message = ?')
-                params.append(error_message)
-
-            if email_sent is not None:
-                updates.append('email_sent = ?')
-                params.append(int(email_sent))
-
-            if retry_count is not None:
-                updates.append('retry_count = ?')
-                params.append(retry_count)
-
-            if transcript_source is not None:
-                updates.append('transcript_source = ?')
-                params.append(transcript_source)
-
-            params.append(video_id)
-
-            cursor.execute(f"""
+            # Fixed statement (cached by sqlite3); None leaves a column unchanged
+            cursor.execute("""
                 UPDATE videos
-                SET {', '.join(updates)}
+                SET processing_status = ?,
+                    summary_text = COALESCE(?, summary_text),
+                    summary_length = COALESCE(?, summary_length),
+                    error_message = COALESCE(?, error_message),
+                    email_sent = COALESCE(?, email_sent),
+                    retry_count = COALESCE(?, retry_count),
+                    transcript_source = COALESCE(?, transcript_source)
                 WHERE id = ?
-            """, params)
+            """, (
+                status,
+                summary_text,
+                summary_length,
+                error_message,
+                None if email_sent is None else int(email_sent),
+                retry_count,
+                transcript_source,
+                video_id
+            ))
 
     def update_video_metadata(
         self,
@@ -821,8 +1367,9 @@ class VideoDatabase:
         """Get full video details by ID including summary"""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM videos WHERE id = ?
+            cursor.execute(f"""
+                SELECT {self.VIDEO_COLUMNS}, {self.VIDEO_SUMMARY_COLUMNS}
+                FROM videos WHERE id = ?
             """, (video_id,))
 
             row = cursor.fetchone()
@@ -847,7 +1394,8 @@ class VideoDatabase:
             # Delete the video
             cursor.execute("DELETE FROM videos WHERE id = ?", (video_id,))
             conn.commit()
-            return True
+
+        return True
 
     def get_transcript_cache(self, video_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve cached transcript status for a video if available."""
@@ -944,39 +1492,63 @@ class VideoDatabase:
         Delete all videos from the database
         Returns number of videos deleted
         """
-        # Get count first
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) as count FROM videos")
-            count = cursor.fetchone()['count']
-
-        # Delete all videos
+        # Delete all videos and take the count from the DELETE itself
+        # (single transaction - no window for inserts between count and delete)
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM videos")
+            count = cursor.rowcount
 
-        # Vacuum in a separate connection (cannot be in a transaction)
-        conn = sqlite3.connect(self.db_path)
-        conn.execute("VACUUM")
-        conn.close()
+        # Return the freed pages to the filesystem (cheap: no table rebuild)
+        self._reclaim_free_space()
 
         return count
 
-    def export_all_videos(self) -> List[Dict]:
+    def _reclaim_free_space(self):
+        """
+        Release free pages after a large delete with PRAGMA incremental_vacuum.
+
+        Only truncates the file, so the write lock is held briefly. Databases
+        not yet in auto_vacuum=INCREMENTAL mode keep their free pages here; the
+        next startup converts them (_migrate_incremental_vacuum) once enough
+        of the file is free.
+        """
+        try:
+            with self._get_connection() as conn:
+                auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+                if auto_vacuum == 2:
+                    # executescript runs the pragma to completion (execute() stops after one page)
+                    conn.executescript("PRAGMA incremental_vacuum;")
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not reclaim database space: {e}")
+
+    def export_all_videos(self, include_derived: bool = False, raw_rows: bool = False) -> Iterator[Dict]:
         """
         Export all videos from database for backup/export purposes.
 
-        Returns:
-            List of video dictionaries with all fields including summary_text
+        Rows are yielded as they are read so callers can stream them to a
+        JSON/CSV writer; wrap in list() when a full list is needed. The
+        connection stays checked out until the iterator is exhausted or closed.
+
+        Args:
+            include_derived: Also compute duration_formatted, hours_saved,
+                youtube_url and channel_url in the query (used by the CSV export)
+            raw_rows: Yield the sqlite3.Row objects as-is (selected columns in
+                order, derived columns last) instead of building dictionaries
+
+        Yields:
+            Video dictionaries with all fields including summary_text
         """
+        derived_columns = self.EXPORT_DERIVED_COLUMNS if include_derived else ""
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT
                     id as video_id,
                     title,
                     channel_id,
-                    channel_name,
+                    channel_display_name AS channel_name,
                     duration_seconds,
                     view_count,
                     upload_date,
@@ -990,17 +1562,21 @@ class VideoDatabase:
                     transcript_source,
                     created_at,
                     created_at as updated_at
+                    {derived_columns}
                 FROM videos
                 ORDER BY processed_date DESC
             """)
 
-            videos = []
-            for row in cursor.fetchall():
-                videos.append({
+            if raw_rows:
+                yield from cursor
+                return
+
+            for row in cursor:
+                video = {
                     'video_id': row['video_id'],
                     'title': row['title'],
                     'channel_id': row['channel_id'],
-                    'channel_name': row['channel_name'] or row['channel_id'],
+                    'channel_name': row['channel_name'],
                     'duration_seconds': row['duration_seconds'],
                     'view_count': row['view_count'],
                     'upload_date': row['upload_date'],
@@ -1014,9 +1590,34 @@ class VideoDatabase:
                     'transcript_source': row['transcript_source'] if 'transcript_source' in row.keys() else None,
                     'created_at': row['created_at'],
                     'updated_at': row['updated_at']
-                })
+                }
+                if include_derived:
+                    video['duration_formatted'] = row['duration_formatted']
+                    video['hours_saved'] = row['hours_saved']
+                    video['youtube_url'] = row['youtube_url']
+                    video['channel_url'] = row['channel_url']
+                yield video
+
+    def _build_bulk_insert_rows(self, videos: List[Dict]) -> List[tuple]:
+        """
+        Build executemany parameter tuples for bulk_insert_videos.
 
-            return videos
+        Complete records (e.g. files written by ExportManager) are extracted with
+        one C-level itemgetter call; records missing optional keys fall back to
+        per-field defaults.
+        """
+        extract = self._BULK_INSERT_EXTRACT
+        fields = self.BULK_INSERT_FIELDS
+        defaults = dict(self._BULK_INSERT_DEFAULTS, created_at=datetime.now().isoformat())
+
+        rows = []
+        append = rows.append
+        for video in videos:
+            try:
+                append(extract(video))
+            except KeyError:
+                append(tuple(video.get(field, defaults.get(field)) for field in fields))
+        return rows
 
     def bulk_insert_videos(self, videos: List[Dict], skip_duplicates: bool = True) -> int:
         """
@@ -1025,6 +1626,8 @@ class VideoDatabase:
         Args:
             videos: List of video dictionaries with all fields
             skip_duplicates: If True, skip videos that already exist (by video_id)
+                and rows that would violate a NOT NULL constraint (null
+                channel_id/title); the rest are still inserted
 
         Returns:
             Number of videos inserted
@@ -1032,55 +1635,33 @@ class VideoDatabase:
         Raises:
             Exception: If database error occurs (transaction will be rolled back)
         """
-        inserted_count = 0
+        videos = [video for video in videos if video.get('video_id')]  # Skip videos without ID
+        if not videos:
+            return 0
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            for video in videos:
-                video_id = video.get('video_id')
+            # One write transaction for the whole import (single journal sync)
+            cursor.execute("BEGIN IMMEDIATE")
 
-                if not video_id:
-                    continue  # Skip videos without ID
+            rows = self._build_bulk_insert_rows(videos)
 
-                # Check if exists (if skip_duplicates enabled)
-                if skip_duplicates:
-                    cursor.execute("SELECT 1 FROM videos WHERE id = ?", (video_id,))
-                    if cursor.fetchone():
-                        continue  # Skip duplicate
+            if skip_duplicates:
+                # ON CONFLICT only covers the primary key; drop rows a NOT NULL
+                # constraint would reject so one bad record can't fail the batch
+                not_null = self._BULK_INSERT_NOT_NULL
+                valid_rows = [row for row in rows if all(row[i] is not None for i in not_null)]
+                if len(valid_rows) != len(rows):
+                    print(f"⚠️ Skipped {len(rows) - len(valid_rows)} videos with null channel_id/title")
+                rows = valid_rows
 
-                try:
-                    cursor.execute("""
-                        INSERT INTO videos
-                        (id, channel_id, channel_name, title, duration_seconds, view_count,
-                         upload_date, summary_length, summary_text, processing_status,
-                         error_message, email_sent, source_type, transcript_source, processed_date, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        video_id,
-                        video.get('channel_id', ''),
-                        video.get('channel_name'),
-                        video.get('title', ''),
-                        video.get('duration_seconds'),
-                        video.get('view_count'),
-                        video.get('upload_date'),
-                        video.get('summary_length'),
-                        video.get('summary_text'),
-                        video.get('processing_status', 'pending'),
-                        video.get('error_message'),
-                        int(video.get('email_sent', False)),
-                        video.get('source_type', 'via_channel'),
-                        video.get('transcript_source'),
-                        video.get('processed_date'),
-                        video.get('created_at', datetime.now().isoformat())
-                    ))
-                    inserted_count += 1
-
-                except sqlite3.IntegrityError as e:
-                    if skip_duplicates:
-                        continue  # Skip on constraint violation
-                    else:
-                        raise  # Re-raise if not skipping
+            # The primary key does the duplicate check (existing rows and repeats
+            # within the import); rowcount counts only rows actually inserted.
+            # Without skip_duplicates a conflict raises and rolls back everything
+            insert_sql = self._BULK_INSERT_SKIP_DUPLICATES_SQL if skip_duplicates else self._BULK_INSERT_SQL
+            cursor.executemany(insert_sql, rows)
+            inserted_count = cursor.rowcount
 
             conn.commit()
 
@@ -1127,18 +1708,16 @@ class VideoDatabase:
                 ORDER BY key
             """)
 
-            settings = {}
-            for row in cursor.fetchall():
-                key, value, type_, encrypted, description = row
-
-                settings[key] = {
+            # Values are plain text - build the mapping in a single pass
+            return {
+                key: {
                     'value': value,
                     'type': type_,
                     'description': description or '',
                     'encrypted': bool(encrypted)  # Legacy field, always False
                 }
-
-            return settings
+                for key, value, type_, encrypted, description in cursor.fetchall()
+            }
 
     def set_setting(self, key: str, value: str, encrypt: Optional[bool] = None) -> bool:
         """
@@ -1181,26 +1760,25 @@ class VideoDatabase:
         Returns:
             Number of settings updated
         """
-        updated_count = 0
+        if not settings:
+            return 0
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            for key, value in settings.items():
-                # Store as plain text (encrypted always = 0)
-                cursor.execute("""
-                    INSERT INTO settings (key, value, type, encrypted, description, updated_at)
-                    VALUES (?, ?, 'text', 0, '', CURRENT_TIMESTAMP)
-                    ON CONFLICT(key) DO UPDATE SET
-                        value = excluded.value,
-                        encrypted = 0,
-                        updated_at = CURRENT_TIMESTAMP
-                """, (key, value))
-                updated_count += 1
+            # Store as plain text (encrypted always = 0), one statement and one commit
+            cursor.executemany("""
+                INSERT INTO settings (key, value, type, encrypted, description, updated_at)
+                VALUES (?, ?, 'text', 0, '', CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    encrypted = 0,
+                    updated_at = CURRENT_TIMESTAMP
+            """, settings.items())
 
             conn.commit()
 
-        return updated_count
+        return len(settings)
 
     def delete_setting(self, key: str) -> bool:
         """
@@ -1237,17 +1815,36 @@ class VideoDatabase:
                 ORDER BY channel_name
             """)
 
-            channels = []
-            for row in cursor.fetchall():
-                channels.append({
-                    'channel_id': row[0],
-                    'channel_name': row[1],
-                    'enabled': bool(row[2]),
-                    'added_at': row[3],
-                    'updated_at': row[4]
-                })
+            return [
+                {
+                    'channel_id': channel_id,
+                    'channel_name': channel_name,
+                    'enabled': bool(enabled),
+                    'added_at': added_at,
+                    'updated_at': updated_at
+                }
+                for channel_id, channel_name, enabled, added_at, updated_at in cursor.fetchall()
+            ]
+
+    def export_channels(self) -> List[Dict[str, str]]:
+        """
+        Get all channels for backup/export purposes.
+
+        Returns:
+            List of channel dicts with channel_id, channel_name (ordered by name)
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT channel_id, channel_name
+                FROM channels
+                ORDER BY channel_name
+            """)
 
-            return channels
+            return [
+                {'channel_id': channel_id, 'channel_name': channel_name}
+                for channel_id, channel_name in cursor.fetchall()
+            ]
 
     def get_enabled_channels(self) -> Tuple[List[str], Dict[str, str], Dict[str, Optional[str]]]:
         """
@@ -1268,17 +1865,10 @@ class VideoDatabase:
                 ORDER BY channel_name
             """)
 
-            channel_ids = []
-            channel_names = {}
-            channel_added_dates = {}
-
-            for row in cursor.fetchall():
-                channel_id = row[0]
-                channel_name = row[1]
-                added_at = row[2]
-                channel_ids.append(channel_id)
-                channel_names[channel_id] = channel_name
-                channel_added_dates[channel_id] = added_at
+            rows = cursor.fetchall()
+            channel_ids = [channel_id for channel_id, _, _ in rows]
+            channel_names = {channel_id: channel_name for channel_id, channel_name, _ in rows}
+            channel_added_dates = {channel_id: added_at for channel_id, _, added_at in rows}
 
             return channel_ids, channel_names, channel_added_dates
 
@@ -1296,17 +1886,14 @@ class VideoDatabase:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            try:
-                cursor.execute("""
-                    INSERT INTO channels (channel_id, channel_name, enabled)
-                    VALUES (?, ?, 1)
-                """, (channel_id, channel_name or channel_id))
-                conn.commit()
-                return True
-
-            except sqlite3.IntegrityError:
-                # Already exists
-                return False
+            # An existing channel is left untouched (rowcount 0) instead of raising
+            cursor.execute("""
+                INSERT INTO channels (channel_id, channel_name, enabled)
+                VALUES (?, ?, 1)
+                ON CONFLICT(channel_id) DO NOTHING
+            """, (channel_id, channel_name or channel_id))
+            conn.commit()
+            return cursor.rowcount == 1
 
     def remove_channel(self, channel_id: str) -> bool:
         """
@@ -1379,34 +1966,29 @@ class VideoDatabase:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            # Get existing channels with their added_at timestamps
-            cursor.execute("SELECT channel_id, added_at FROM channels")
-            existing_channels = {row[0]: row[1] for row in cursor.fetchall()}
-
-            # Clear existing channels
-            cursor.execute("DELETE FROM channels")
-
-            # Insert channels, preserving added_at for existing ones
-            for channel_id in channels:
-                channel_name = names.get(channel_id, channel_id)
-
-                # If channel existed before, preserve its added_at timestamp
-                if channel_id in existing_channels:
-                    cursor.execute("""
-                        INSERT INTO channels (channel_id, channel_name, enabled, added_at)
-                        VALUES (?, ?, 1, ?)
-                    """, (channel_id, channel_name, existing_channels[channel_id]))
-                else:
-                    # New channel - use current timestamp
-                    cursor.execute("""
-                        INSERT INTO channels (channel_id, channel_name, enabled)
-                        VALUES (?, ?, 1)
-                    """, (channel_id, channel_name))
+            # Drop channels no longer in the list (row-by-row avoids the bound-variable limit)
+            keep = set(channels)
+            cursor.execute("SELECT channel_id FROM channels")
+            stale = [(row[0],) for row in cursor.fetchall() if row[0] not in keep]
+            cursor.executemany("DELETE FROM channels WHERE channel_id = ?", stale)
+
+            # Upsert the rest in place; existing rows keep their added_at timestamp
+            cursor.executemany("""
+                INSERT INTO channels (channel_id, channel_name, enabled)
+                VALUES (?, ?, 1)
+                ON CONFLICT(channel_id) DO UPDATE SET
+                    channel_name = excluded.channel_name,
+                    enabled = 1,
+                    updated_at = CURRENT_TIMESTAMP
+            """, [(channel_id, names.get(channel_id, channel_id)) for channel_id in channels])
 
             conn.commit()
             return True
 
 
+atexit.register(VideoDatabase.close_all_connections)
+
+
 if __name__ == '__main__':
     # Test the database
     print("Testing VideoDatabase...")
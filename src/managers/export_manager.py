@@ -5,25 +5,88 @@ Supports two export levels:
 1. Feed Export - Channels + videos with summaries
 2. Complete Backup - Feed + settings + AI prompt (no credentials)
 
-Supports two formats:
+Supports three formats:
 - JSON (structured, import-capable)
 - CSV (analysis-friendly, videos only)
+- MessagePack (compact binary Feed Export, optional msgpack package)
 """
 
 import csv
-import io
+import hashlib
+import json
 import logging
+from itertools import islice
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from src.managers.database import VideoDatabase
 from src.managers.config_manager import ConfigManager
 from src.managers.settings_manager import SettingsManager
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 
 logger = logging.getLogger(__name__)
 
 
+def _text(value: Any) -> str:
+    """CSV cell text: '' for None/empty/zero, else str(value) (a no-op for str)."""
+    return str(value) if value else ""
+
+
+def _to_bool(value: Any) -> Any:
+    """Coerce "true"/"1" (any case) to True and other strings to False."""
+    if isinstance(value, str):
+        return value.lower() in ("true", "1")
+    return value
+
+
+def _to_int(value: Any) -> Any:
+    """Coerce digit-only strings to int."""
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return value
+
+
+def _to_scalar(value: Any) -> Any:
+    """Coerce "true"/"false" strings to bool and digit-only strings to int."""
+    if isinstance(value, str):
+        lowered = value.lower()
+        if lowered in ("true", "false"):
+            return lowered == "true"
+        if value.isdigit():
+            return int(value)
+    return value
+
+
+class _ListWriter:
+    """Minimal file-like sink for csv.writer: collects written strings in a list."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self):
+        self.parts: List[str] = []
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+
+    def pop_chunk(self) -> str:
+        """Return everything written so far and start a new chunk."""
+        chunk = "".join(self.parts)
+        self.parts.clear()
+        return chunk
+
+
 class ExportManager:
     """Manages export operations for channels, videos, and settings."""
 
@@ -41,17 +104,63 @@ class ExportManager:
     # Credentials to exclude from export (security - these should NOT be exported)
     # Only actual secrets are excluded - API keys and passwords
     # Email addresses (TARGET_EMAIL, SMTP_USER) ARE exported for backup purposes
-    EXCLUDED_CREDENTIALS = {
+    EXCLUDED_CREDENTIALS = frozenset({
         "OPENAI_API_KEY",   # OpenAI API key - never export
         "SMTP_PASS",        # Gmail App Password - never export
         "SMTP_PASSWORD",    # Alias for SMTP_PASS - never export
+    })
+
+    # Type coercion for exported env settings (other keys are exported as-is)
+    ENV_SETTING_COERCERS = {
+        "SEND_EMAIL_SUMMARIES": _to_bool,
+        "CHECK_INTERVAL_HOURS": _to_int,
+        "MAX_PROCESSED_ENTRIES": _to_int,
     }
 
+    # Config (non-env) settings to export, in export order, with their coercion
+    CONFIG_SETTING_COERCERS = {
+        "SUMMARY_LENGTH": _to_scalar,
+        "USE_SUMMARY_LENGTH": _to_bool,
+        "SKIP_SHORTS": _to_bool,
+        "CHECK_INTERVAL_MINUTES": _to_scalar,
+        "MAX_FEED_ENTRIES": _to_scalar,
+    }
+
+    # CSV columns (19 total), in the order _format_csv_tuple returns them
+    CSV_FIELDNAMES = (
+        "video_id",
+        "title",
+        "channel_id",
+        "channel_name",
+        "duration_seconds",
+        "duration_formatted",
+        "view_count",
+        "upload_date",
+        "processing_status",
+        "summary_text",
+        "summary_length",
+        "email_sent",
+        "processed_date",
+        "error_message",
+        "hours_saved",
+        "youtube_url",
+        "channel_url",
+        "created_at",
+        "updated_at",
+    )
+
+    # BOM (for Excel) + quoted header line, built once instead of per export
+    CSV_HEADER = "\ufeff" + ",".join('"%s"' % name for name in CSV_FIELDNAMES) + "\r\n"
+
+    # Video rows buffered per chunk yielded by iter_videos_csv
+    CSV_CHUNK_ROWS = 500
+
     def __init__(
         self,
         db_path: str = "data/videos.db",
         config_path: str = "config.txt",  # Unused, kept for backward compatibility
         env_path: str = ".env",  # Unused, kept for backward compatibility
+        db: Optional[VideoDatabase] = None,
     ):
         """
         Initialize ExportManager.
@@ -60,10 +169,17 @@ class ExportManager:
             db_path: Path to SQLite database
             config_path: Unused, kept for backward compatibility
             env_path: Unused, kept for backward compatibility
+            db: Optional existing VideoDatabase to share (db_path is then ignored)
         """
-        self.db = VideoDatabase(db_path)
-        self.config_manager = ConfigManager(db_path=db_path)
-        self.settings_manager = SettingsManager(db_path=db_path)
+        # One VideoDatabase shared by all three managers
+        self.db = db if db is not None else VideoDatabase(db_path)
+        self.config_manager = ConfigManager(db=self.db)
+        self.settings_manager = SettingsManager(db=self.db)
+
+        # Extracted channels/settings (small), valid while the database state
+        # they were read at (see _get_db_state) is unchanged
+        self._cache: Dict[str, Any] = {}
+        self._cache_state: Optional[Tuple] = None
 
     def export_feed_json(self) -> Dict[str, Any]:
         """
@@ -78,7 +194,9 @@ class ExportManager:
         logger.info("Generating Feed Export (JSON)")
 
         try:
-            channels = self._get_channels()
+            channels = self._cached("channels", self._get_channels)
+            # Videos (summaries included) are re-read per export and never cached,
+            # so they are only held in memory while a response is being built
             videos = self._get_videos()
 
             export_data = {
@@ -96,12 +214,12 @@ class ExportManager:
             }
 
             logger.info(
-                f"Feed Export generated: {len(channels)} channels, {len(videos)} videos"
+                "Feed Export generated: %d channels, %d videos", len(channels), len(videos)
             )
             return export_data
 
         except Exception as e:
-            logger.error(f"Feed Export failed: {e}")
+            logger.error("Feed Export failed: %s", e)
             raise
 
     def export_complete_backup_json(self) -> Dict[str, Any]:
@@ -126,19 +244,112 @@ class ExportManager:
             export_data["export_level"] = self.EXPORT_LEVEL_COMPLETE
 
             # Add settings (non-secret only)
-            settings = self._get_settings()
+            settings = self._cached("settings", self._get_settings)
             export_data["settings"] = settings
 
             logger.info(
-                f"Complete Backup generated: {len(export_data['channels'])} channels, "
-                f"{len(export_data['videos'])} videos, {len(settings)} settings"
+                "Complete Backup generated: %d channels, %d videos, %d settings",
+                len(export_data["channels"]),
+                len(export_data["videos"]),
+                len(settings),
             )
             return export_data
 
         except Exception as e:
-            logger.error(f"Complete Backup Export failed: {e}")
+            logger.error("Complete Backup Export failed: %s", e)
             raise
 
+    def export_etag(self, export_type: str) -> str:
+        """
+        Weak ETag for an export, derived from the data change stamps.
+
+        Equal tags mean the exported channels/videos/settings are unchanged
+        (only export_timestamp would differ), so HTTP callers can answer
+        If-None-Match with 304 before doing any export work.
+
+        Args:
+            export_type: Export variant, e.g. 'feed_export', 'videos', 'full_backup'
+
+        Returns:
+            ETag header value (W/"<sha1>")
+        """
+        key = repr((self.APP_VERSION, self.SCHEMA_VERSION, export_type, self._get_db_state()))
+        return f'W/"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+    def invalidate_cache(self) -> None:
+        """Drop cached export data so the next export re-reads the database."""
+        self._cache.clear()
+        self._cache_state = None
+
+    def _cached(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return loader()'s result, reusing it until the database changes.
+
+        Shared by export_feed_json and export_complete_backup_json, so
+        exporting the feed and then the backup (or repeating either) reads
+        channels/settings once. Only small sections belong here: videos are
+        streamed from the database on every export (repeat downloads are
+        answered by the ETag/304 path instead). Callers must not mutate the
+        result.
+        """
+        # Read the state before loading: a write during the load changes it
+        # again, so the possibly stale result is dropped on the next call
+        state = self._get_db_state()
+        if state != self._cache_state:
+            self._cache.clear()
+            self._cache_state = state
+
+        if key not in self._cache:
+            self._cache[key] = loader()
+        return self._cache[key]
+
+    def _get_db_state(self) -> Tuple[Tuple[str, int], ...]:
+        """
+        Change token for the exported data: the trigger-maintained change
+        stamps of the videos/channels/settings tables (see
+        VideoDatabase.get_change_stamps). Derived from the data itself, so
+        WAL checkpoints or same-size rewrites cannot fake an unchanged state.
+        """
+        return self.db.get_change_stamps()
+
+    @staticmethod
+    def to_json_bytes(data: Dict[str, Any]) -> bytes:
+        """
+        Serialize export data to pretty-printed UTF-8 JSON.
+
+        Uses orjson (C implementation, encodes straight to bytes) when it is
+        installed, otherwise the standard library json module.
+
+        Args:
+            data: Export dictionary from export_feed_json/export_complete_backup_json
+
+        Returns:
+            JSON document as UTF-8 bytes (2-space indent, non-ASCII kept as-is)
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def export_feed_msgpack(self) -> bytes:
+        """
+        Export Feed level data as MessagePack.
+
+        Same payload as export_feed_json, packed into the binary MessagePack
+        format (smaller and faster to encode/decode than JSON) for
+        machine-to-machine backups.
+
+        Returns:
+            MessagePack-encoded Feed Export
+
+        Raises:
+            RuntimeError: If the msgpack package is not installed
+            Exception: If database or config read fails
+        """
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("MessagePack export requires the msgpack package")
+
+        return msgpack.packb(self.export_feed_json())
+
     def export_videos_csv(self) -> str:
         """
         Export videos to CSV format.
@@ -146,65 +357,64 @@ class ExportManager:
         Returns:
             CSV string with headers and all video rows
 
+        Raises:
+            Exception: If database read fails
+        """
+        return "".join(self.iter_videos_csv())
+
+    def iter_videos_csv(self) -> Iterator[str]:
+        """
+        Export videos to CSV format as a stream of text chunks.
+
+        Rows are collected in a small list that is joined and flushed every
+        CSV_CHUNK_ROWS rows, so memory stays bounded regardless of the number
+        of videos.
+        Suitable for passing (encoded) to a streaming HTTP response.
+
+        Yields:
+            CSV text chunks; the first starts with the UTF-8 BOM and header
+
         Raises:
             Exception: If database read fails
         """
         logger.info("Generating Videos Export (CSV)")
 
         try:
-            videos = self._get_videos()
+            output = _ListWriter()
 
-            # Create CSV in memory
-            output = io.StringIO()
-
-            # Write UTF-8 BOM for Excel compatibility
-            output.write("\ufeff")
-
-            # Define CSV columns (19 total)
-            fieldnames = [
-                "video_id",
-                "title",
-                "channel_id",
-                "channel_name",
-                "duration_seconds",
-                "duration_formatted",
-                "view_count",
-                "upload_date",
-                "processing_status",
-                "summary_text",
-                "summary_length",
-                "email_sent",
-                "processed_date",
-                "error_message",
-                "hours_saved",
-                "youtube_url",
-                "channel_url",
-                "created_at",
-                "updated_at",
-            ]
-
-            writer = csv.DictWriter(
+            # UTF-8 BOM for Excel compatibility + precomputed header row
+            output.write(self.CSV_HEADER)
+
+            writer = csv.writer(
                 output,
-                fieldnames=fieldnames,
                 quoting=csv.QUOTE_NONNUMERIC,
                 lineterminator="\r\n",
             )
 
-            writer.writeheader()
+            # Rows are formatted lazily from the database cursor (no full list);
+            # writerows() drives each chunk's write loop in C
+            rows = map(
+                self._format_csv_tuple,
+                self.db.export_all_videos(include_derived=True, raw_rows=True),
+            )
+            video_count = 0
+            while True:
+                batch = list(islice(rows, self.CSV_CHUNK_ROWS))
+                if not batch:
+                    break
+                writer.writerows(batch)
+                video_count += len(batch)
 
-            # Write video rows
-            for video in videos:
-                row = self._format_csv_row(video)
-                writer.writerow(row)
+                yield output.pop_chunk()
 
-            csv_content = output.getvalue()
-            output.close()
+            # Header only (no videos)
+            if output.parts:
+                yield output.pop_chunk()
 
-            logger.info(f"CSV Export generated: {len(videos)} videos")
-            return csv_content
+            logger.info("CSV Export generated: %d videos", video_count)
 
         except Exception as e:
-            logger.error(f"CSV Export failed: {e}")
+            logger.error("CSV Export failed: %s", e)
             raise
 
     def _get_channels(self) -> List[Dict[str, Any]]:
@@ -222,11 +432,11 @@ class ExportManager:
                 logger.warning("No channels found in config")
                 return []
 
-            logger.debug(f"Extracted {len(channels_list)} channels from config")
+            logger.debug("Extracted %d channels from config", len(channels_list))
             return channels_list
 
         except Exception as e:
-            logger.error(f"Failed to extract channels: {e}")
+            logger.error("Failed to extract channels: %s", e)
             raise
 
     def _get_videos(self) -> List[Dict[str, Any]]:
@@ -237,12 +447,12 @@ class ExportManager:
             List of video dictionaries with all fields
         """
         try:
-            videos = self.db.export_all_videos()
-            logger.debug(f"Extracted {len(videos)} videos from database")
+            videos = list(self.db.export_all_videos())
+            logger.debug("Extracted %d videos from database", len(videos))
             return videos
 
         except Exception as e:
-            logger.error(f"Failed to extract videos: {e}")
+            logger.error("Failed to extract videos: %s", e)
             raise
 
     def _get_settings(self) -> Dict[str, Any]:
@@ -257,150 +467,112 @@ class ExportManager:
         settings = {}
 
         try:
-            # Get all settings from database
-            all_settings = self.config_manager.get_settings()
+            # Read the settings table once and derive all three views from it
+            db_settings = self.db.get_all_settings()
+            all_settings = self.config_manager.get_settings(db_settings)
 
             # Get AI prompt template
-            ai_prompt = self.config_manager.get_prompt()
+            ai_prompt = self.config_manager.get_prompt(db_settings)
             if ai_prompt:
                 settings["ai_prompt_template"] = ai_prompt
 
             # Get application settings (exclude credentials)
-            env_settings = self.settings_manager.get_all_settings(mask_secrets=False)
+            env_settings = self.settings_manager.get_all_settings(
+                mask_secrets=False, db_settings=db_settings
+            )
 
-            # Settings that should be exported as boolean (env settings)
-            env_boolean_settings = {"SEND_EMAIL_SUMMARIES"}
-            # Settings that should be exported as integers (env settings)
-            env_integer_settings = {"CHECK_INTERVAL_HOURS", "MAX_PROCESSED_ENTRIES"}
+            excluded = self.EXCLUDED_CREDENTIALS
+            env_coercers = self.ENV_SETTING_COERCERS
 
-            env_exported_count = 0
             for key, value in env_settings.items():
-                if key not in self.EXCLUDED_CREDENTIALS:
-                    # Extract actual value from nested dict structure
-                    # get_all_settings() returns {'key': {'value': 'actual_value', 'type': '...', ...}}
-                    if isinstance(value, dict) and 'value' in value:
-                        extracted_value = value['value']
-                    else:
-                        extracted_value = value  # Fallback for simple values
-
-                    # Convert boolean settings to actual boolean
-                    if key in env_boolean_settings and isinstance(extracted_value, str):
-                        extracted_value = extracted_value.lower() in ("true", "1")
-                    # Convert integer settings to actual integers
-                    elif key in env_integer_settings and isinstance(extracted_value, str) and extracted_value.isdigit():
-                        extracted_value = int(extracted_value)
-
-                    settings[key] = extracted_value
-                    env_exported_count += 1
-                else:
-                    logger.debug(f"Skipping credential: {key}")
+                if key in excluded:
+                    logger.debug("Skipping credential: %s", key)
+                    continue
+
+                # Extract actual value from nested dict structure
+                # get_all_settings() returns {'key': {'value': 'actual_value', 'type': '...', ...}}
+                if isinstance(value, dict) and 'value' in value:
+                    value = value['value']
+
+                coerce = env_coercers.get(key)
+                settings[key] = coerce(value) if coerce else value
 
             # Add config settings (non-env settings)
-            config_keys = [
-                "SUMMARY_LENGTH",
-                "USE_SUMMARY_LENGTH",
-                "SKIP_SHORTS",
-                "CHECK_INTERVAL_MINUTES",
-                "MAX_FEED_ENTRIES",
-            ]
-
-            # Settings that should be exported as boolean
-            boolean_settings = {"USE_SUMMARY_LENGTH", "SKIP_SHORTS"}
-
-            for key in config_keys:
+            for key, coerce in self.CONFIG_SETTING_COERCERS.items():
                 value = all_settings.get(key)
                 if value is not None:
-                    # Convert boolean settings first (before int conversion)
-                    if key in boolean_settings:
-                        if isinstance(value, str):
-                            # Accept "true", "false", "1", "0"
-                            value = value.lower() in ("true", "1")
-                        # If already boolean, keep it
-                    # Convert string booleans to actual booleans (for non-boolean settings)
-                    elif isinstance(value, str) and value.lower() in ("true", "false"):
-                        value = value.lower() == "true"
-                    # Convert string integers to actual integers
-                    elif isinstance(value, str) and value.isdigit():
-                        value = int(value)
-                    settings[key] = value
-
-            logger.debug(f"Extracted {len(settings)} total settings from database")
+                    settings[key] = coerce(value)
+
+            logger.debug("Extracted %d total settings from database", len(settings))
             return settings
 
         except Exception as e:
-            logger.error(f"Failed to extract settings: {e}")
+            logger.error("Failed to extract settings: %s", e)
             raise
 
-    def _format_csv_row(self, video: Dict[str, Any]) -> Dict[str, str]:
+    def _format_csv_tuple(self, row: Sequence[Any]) -> Tuple[str, ...]:
         """
-        Format video dictionary as CSV row with calculated fields.
+        Format a raw video row as CSV row with calculated fields.
 
         Args:
-            video: Video dictionary from database
+            row: sqlite3.Row from export_all_videos(include_derived=True, raw_rows=True)
 
         Returns:
-            Dictionary with all CSV fields
+            Tuple of all CSV fields, in CSV_FIELDNAMES order
         """
-        # Calculate duration formatted (MM:SS or HH:MM:SS)
-        duration_seconds = video.get("duration_seconds", 0)
-        if duration_seconds >= 3600:
-            hours = duration_seconds // 3600
-            minutes = (duration_seconds % 3600) // 60
-            seconds = duration_seconds % 60
-            duration_formatted = f"{hours}:{minutes:02d}:{seconds:02d}"
-        else:
-            minutes = duration_seconds // 60
-            seconds = duration_seconds % 60
-            duration_formatted = f"{minutes}:{seconds:02d}"
-
-        # Calculate hours saved (duration * 0.8 / 3600)
-        hours_saved = round(duration_seconds * 0.8 / 3600, 2)
-
-        # Generate URLs
-        video_id = video.get("video_id", "")
-        channel_id = video.get("channel_id", "")
-        youtube_url = f"https://youtube.com/watch?v={video_id}" if video_id else ""
-        channel_url = (
-            f"https://youtube.com/channel/{channel_id}" if channel_id else ""
+        # Positional unpack in export query column order; duration_formatted,
+        # hours_saved and the URLs are computed by the query itself
+        (
+            video_id, title, channel_id, channel_name, duration_seconds,
+            view_count, upload_date, processing_status, summary_text,
+            summary_length, email_sent, processed_date, error_message,
+            _source_type, _transcript_source, created_at, updated_at,
+            duration_formatted, hours_saved, youtube_url, channel_url,
+        ) = row
+        text = _text
+        return (
+            video_id,
+            title,
+            channel_id,
+            channel_name,
+            str(duration_seconds or 0),
+            duration_formatted,
+            text(view_count),
+            text(upload_date),
+            processing_status,
+            text(summary_text),
+            text(summary_length),
+            "true" if email_sent else "false",
+            text(processed_date),
+            text(error_message),
+            str(hours_saved),
+            youtube_url,
+            channel_url,
+            text(created_at),
+            text(updated_at),
         )
 
-        # Convert boolean to string
-        email_sent = str(video.get("email_sent", False)).lower()
-
-        return {
-            "video_id": video.get("video_id", ""),
-            "title": video.get("title", ""),
-            "channel_id": channel_id,
-            "channel_name": video.get("channel_name", ""),
-            "duration_seconds": str(duration_seconds),
-            "duration_formatted": duration_formatted,
-            "view_count": str(video.get("view_count") or ""),
-            "upload_date": video.get("upload_date") or "",
-            "processing_status": video.get("processing_status", ""),
-            "summary_text": video.get("summary_text") or "",
-            "summary_length": str(video.get("summary_length") or ""),
-            "email_sent": email_sent,
-            "processed_date": video.get("processed_date") or "",
-            "error_message": video.get("error_message") or "",
-            "hours_saved": str(hours_saved),
-            "youtube_url": youtube_url,
-            "channel_url": channel_url,
-            "created_at": video.get("created_at") or "",
-            "updated_at": video.get("updated_at") or "",
-        }
-
     def generate_export_filename(
-        self, export_type: str, file_format: str = "json"
+        self,
+        export_type: str,
+        file_format: str = "json",
+        timestamp: Optional[datetime] = None,
     ) -> str:
         """
         Generate timestamped filename for export.
 
         Args:
             export_type: 'feed_export', 'videos', or 'full_backup'
-            file_format: 'json' or 'csv'
+            file_format: 'json', 'csv' or 'msgpack'
+            timestamp: Optional export time to reuse (e.g. the parsed
+                export_timestamp of the data); defaults to now
 
         Returns:
             Filename with timestamp (e.g., 'yays_feed_export_2025-10-20_14-30.json')
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
-        return f"yays_{export_type}_{timestamp}.{file_format}"
+        # Filenames use local time; aware timestamps are converted to it.
+        # Integer formatting gives the same YYYY-MM-DD_HH-MM as strftime
+        # without its locale-aware C call
+        t = timestamp.astimezone() if timestamp else datetime.now()
+        stamp = "%04d-%02d-%02d_%02d-%02d" % (t.year, t.month, t.day, t.hour, t.minute)
+        return f"yays_{export_type}_{stamp}.{file_format}"
@@ -8,22 +8,41 @@ Provides:
 - Merge/skip/replace conflict resolution
 """
 
+import hashlib
+import json
 import logging
-import os
-import shutil
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 
 from src.managers.database import VideoDatabase
 from src.managers.config_manager import ConfigManager
 from src.managers.settings_manager import SettingsManager
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _is_id_chars(value: str) -> bool:
+    """
+    True if value only contains word characters and dashes (regex [\\w-]).
+
+    String predicates instead of a regex for the per-record ID validators:
+    str.isalnum() matches the same characters as \\w minus the underscore, and
+    the common dash/underscore-free ID never leaves the fast path. Callers
+    check the length (including non-empty) first.
+    """
+    if value.isalnum():
+        return True
+    stripped = value.replace("-", "").replace("_", "")
+    return not stripped or stripped.isalnum()
+
+
+@dataclass(slots=True, frozen=True)
 class ValidationResult:
     """Result of import file validation."""
     valid: bool
@@ -31,7 +50,7 @@ class ValidationResult:
     warnings: List[str]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImportPreview:
     """Preview of changes that will be applied during import."""
     channels_new: int
@@ -43,7 +62,7 @@ class ImportPreview:
     total_size_mb: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ImportResult:
     """Result of import operation."""
     success: bool
@@ -99,6 +118,15 @@ class ImportManager:
         "processing_status",
     }
 
+    # Settings imported through ConfigManager (the rest go to SettingsManager)
+    CONFIG_SETTING_KEYS = frozenset({
+        "SUMMARY_LENGTH",
+        "USE_SUMMARY_LENGTH",
+        "SKIP_SHORTS",
+        "CHECK_INTERVAL_MINUTES",
+        "MAX_FEED_ENTRIES",
+    })
+
     # Maximum field lengths (security)
     MAX_LENGTHS = {
         "title": 500,
@@ -107,14 +135,27 @@ class ImportManager:
         "channel_name": 200,
     }
 
+    # Optional length-limited video fields, checked in one loop by _validate_video
+    VIDEO_LENGTH_LIMITS = (
+        ("summary_text", MAX_LENGTHS["summary_text"]),
+        ("error_message", MAX_LENGTHS["error_message"]),
+    )
+
     # Maximum file size (50 MB)
     MAX_FILE_SIZE_BYTES = 50 * 1024 * 1024
 
+    # Record errors collected before validation stops early
+    MAX_ERRORS = 100
+
+    # Validation results kept for re-submitted files (validate, then execute)
+    VALIDATION_CACHE_SIZE = 8
+
     def __init__(
         self,
         db_path: str = "data/videos.db",
         config_path: str = "config.txt",  # Unused, kept for backward compatibility
         env_path: str = ".env",  # Unused, kept for backward compatibility
+        db: Optional[VideoDatabase] = None,
     ):
         """
         Initialize ImportManager.
@@ -123,21 +164,65 @@ class ImportManager:
             db_path: Path to SQLite database
             config_path: Unused, kept for backward compatibility
             env_path: Unused, kept for backward compatibility
+            db: Optional existing VideoDatabase to share (db_path is then ignored)
+        """
+        # One VideoDatabase shared by all three managers
+        self.db = db if db is not None else VideoDatabase(db_path)
+        self.config_manager = ConfigManager(db=self.db)
+        self.settings_manager = SettingsManager(db=self.db)
+        self._validation_cache: Dict[str, ValidationResult] = {}
+
+    @staticmethod
+    def parse_json(content: bytes) -> Dict[str, Any]:
         """
-        self.db = VideoDatabase(db_path)
-        self.config_manager = ConfigManager(db_path=db_path)
-        self.settings_manager = SettingsManager(db_path=db_path)
+        Parse an uploaded import file.
 
-    def validate_import_file(self, data: Dict[str, Any]) -> ValidationResult:
+        Uses orjson (faster, fewer allocations) when it is installed,
+        otherwise the standard library json module.
+
+        Raises:
+            json.JSONDecodeError: If content is not valid JSON (orjson's
+                error is a subclass)
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.loads(content)
+        return json.loads(content)
+
+    @staticmethod
+    def content_key(content: bytes) -> str:
+        """Cache key for validate_import_file: digest of the raw import file."""
+        return hashlib.sha1(content).hexdigest()
+
+    def validate_import_file(self, data: Dict[str, Any], cache_key: Optional[str] = None) -> ValidationResult:
         """
         Validate import file structure and data.
 
+        Validation depends only on the file content, so with a cache_key the
+        result is reused when the same file is submitted again (the UI uploads
+        it once to preview and once more to execute).
+
         Args:
             data: Parsed JSON data from import file
+            cache_key: Optional content_key() of the raw file data was parsed from
 
         Returns:
             ValidationResult with validation status and any errors/warnings
+            (callers must not mutate it)
         """
+        if cache_key is None:
+            return self._validate_import_data(data)
+
+        result = self._validation_cache.get(cache_key)
+        if result is None:
+            result = self._validate_import_data(data)
+            if len(self._validation_cache) >= self.VALIDATION_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._validation_cache[next(iter(self._validation_cache))]
+            self._validation_cache[cache_key] = result
+        return result
+
+    def _validate_import_data(self, data: Dict[str, Any]) -> ValidationResult:
+        """Run all validation checks for validate_import_file."""
         errors = []
         warnings = []
 
@@ -168,23 +253,39 @@ class ImportManager:
         if export_level not in ("feed", "complete"):
             errors.append(f"Invalid export_level: {export_level}. Must be 'feed' or 'complete'")
 
+        # Per-record checks stop once MAX_ERRORS is reached and records remain
+        # (fail fast on bad files); stopped_at is the error count at that point
+        stopped_at = 0
+        videos = data.get("videos", [])
+        videos_pending = isinstance(videos, list) and len(videos) > 0
+
         # Validate channels
         channels = data.get("channels", [])
         if not isinstance(channels, list):
             errors.append("'channels' must be a list")
         else:
+            last = len(channels) - 1
             for i, channel in enumerate(channels):
                 channel_errors = self._validate_channel(channel, i)
                 errors.extend(channel_errors)
+                if len(errors) >= self.MAX_ERRORS and (i < last or videos_pending):
+                    stopped_at = len(errors)
+                    break
 
         # Validate videos
-        videos = data.get("videos", [])
         if not isinstance(videos, list):
             errors.append("'videos' must be a list")
-        else:
+        elif not stopped_at:
+            last = len(videos) - 1
             for i, video in enumerate(videos):
                 video_errors = self._validate_video(video, i)
                 errors.extend(video_errors)
+                if len(errors) >= self.MAX_ERRORS and i < last:
+                    stopped_at = len(errors)
+                    break
+
+        if stopped_at:
+            errors.append(f"Validation stopped after {stopped_at} errors, remaining records were not checked")
 
         # Validate settings (if Complete Backup)
         if export_level == "complete":
@@ -208,19 +309,25 @@ class ImportManager:
 
         return ValidationResult(valid=valid, errors=errors, warnings=warnings)
 
-    def preview_import(self, data: Dict[str, Any]) -> ImportPreview:
+    def preview_import(self, data: Dict[str, Any], size_bytes: Optional[int] = None) -> ImportPreview:
         """
         Generate preview of changes that will be applied.
 
         Args:
             data: Validated import data
+            size_bytes: Size of the uploaded file, if known (avoids re-serializing
+                data just to estimate it)
 
         Returns:
             ImportPreview with counts of changes
         """
         # Get current state
         existing_channels, _, _ = self.config_manager.get_channels()
-        existing_settings = self.config_manager.get_settings()
+        existing_channels = set(existing_channels)  # O(1) membership per imported channel
+        # Settings table read once; the prompt comes from the same snapshot
+        db_settings = self.db.get_all_settings()
+        existing_settings = self.config_manager.get_settings(db_settings)
+        current_prompt = self.config_manager.get_prompt(db_settings)
 
         # Count channels
         import_channels = data.get("channels", [])
@@ -236,15 +343,12 @@ class ImportManager:
 
         # Count videos
         import_videos = data.get("videos", [])
-        videos_new = 0
-        videos_duplicate = 0
+        video_ids = [video.get("video_id") for video in import_videos]
 
-        for video in import_videos:
-            video_id = video.get("video_id")
-            if self.db.is_processed(video_id):
-                videos_duplicate += 1
-            else:
-                videos_new += 1
+        # One chunked IN query instead of an is_processed() lookup per video
+        unprocessed_ids = self.db.filter_unprocessed(video_ids)
+        videos_new = sum(1 for video_id in video_ids if video_id in unprocessed_ids)
+        videos_duplicate = len(video_ids) - videos_new
 
         # Count settings changes
         settings_changed = 0
@@ -273,7 +377,6 @@ class ImportManager:
 
                 if key == "ai_prompt_template":
                     # Compare AI prompt
-                    current_prompt = self.config_manager.get_prompt()
                     if current_prompt != new_value:
                         settings_changed += 1
                         settings_details.append(f"✏️ AI Prompt Template: (modified)")
@@ -285,9 +388,10 @@ class ImportManager:
                         # Show clean, minimal preview
                         settings_details.append(f"{key}: {new_value}")
 
-        # Calculate total size (rough estimate)
-        import json
-        total_size_mb = len(json.dumps(data)) / (1024 * 1024)
+        # Calculate total size (re-serializing is only a rough fallback estimate)
+        if size_bytes is None:
+            size_bytes = len(orjson.dumps(data)) if ORJSON_AVAILABLE else len(json.dumps(data))
+        total_size_mb = size_bytes / (1024 * 1024)
 
         return ImportPreview(
             channels_new=channels_new,
@@ -354,55 +458,52 @@ class ImportManager:
                 try:
                     settings = data.get("settings", {})
 
-                    # SECURITY: Filter out credentials before processing
-                    # This prevents malicious export files from overwriting credentials
-                    filtered_settings = {}
+                    # Single pass over the import: filter credentials, unwrap values
+                    # and route each setting to the prompt, config or env bucket
                     skipped_credentials = []
+                    has_database_settings = False
+                    config_keys = self.CONFIG_SETTING_KEYS
+                    config_settings = {}
+                    env_settings = {}
 
                     for key, value in settings.items():
+                        # SECURITY: Filter out credentials before processing
+                        # This prevents malicious export files from overwriting credentials
                         if key in self.EXCLUDED_CREDENTIALS:
                             skipped_credentials.append(key)
                             logger.warning(f"Skipping credential import for security: {key}")
-                        else:
-                            # Extract value if it's a dict (old malformed export format compatibility)
-                            if isinstance(value, dict) and 'value' in value:
-                                logger.debug(f"Extracting value from malformed dict for key: {key}")
-                                filtered_settings[key] = value['value']
-                            else:
-                                filtered_settings[key] = value
+                            continue
 
-                    if skipped_credentials:
-                        logger.info(f"Skipped {len(skipped_credentials)} credentials for security: {skipped_credentials}")
+                        # Extract value if it's a dict (old malformed export format compatibility)
+                        if isinstance(value, dict) and 'value' in value:
+                            logger.debug(f"Extracting value from malformed dict for key: {key}")
+                            value = value['value']
 
-                    # All settings go to database now
-                    database_settings = {}
-
-                    for key, value in filtered_settings.items():
                         if key == "ai_prompt_template":
                             # Handle AI prompt separately
                             self.config_manager.set_prompt(value)
                             settings_updated += 1
-                        else:
-                            database_settings[key] = value
+                            continue
 
-                    # Import all settings to database
-                    if database_settings:
-                        # Filter out empty values (don't overwrite existing settings with empty strings)
-                        non_empty_settings = {k: v for k, v in database_settings.items() if v}
+                        # All other settings go to database; empty values are dropped
+                        # (don't overwrite existing settings with empty strings)
+                        has_database_settings = True
+                        if value:
+                            (config_settings if key in config_keys else env_settings)[key] = value
 
-                        if not non_empty_settings:
+                    if skipped_credentials:
+                        logger.info(f"Skipped {len(skipped_credentials)} credentials for security: {skipped_credentials}")
+
+                    # Import all settings to database
+                    if has_database_settings:
+                        if not config_settings and not env_settings:
                             logger.info("All settings in import are empty, skipping")
                         else:
-                            logger.info(f"Attempting to import {len(non_empty_settings)} settings to database")
-
-                            # Try config settings first
-                            config_keys = {
-                                "SUMMARY_LENGTH", "USE_SUMMARY_LENGTH", "SKIP_SHORTS",
-                                "CHECK_INTERVAL_MINUTES", "MAX_FEED_ENTRIES"
-                            }
-                            config_settings = {k: v for k, v in non_empty_settings.items() if k in config_keys}
-                            env_settings = {k: v for k, v in non_empty_settings.items() if k not in config_keys}
+                            logger.info(
+                                f"Attempting to import {len(config_settings) + len(env_settings)} settings to database"
+                            )
 
+                            # Config settings first
                             if config_settings:
                                 count = self.config_manager.import_settings(config_settings)
                                 settings_updated += count
@@ -458,84 +559,86 @@ class ImportManager:
     def _validate_channel(self, channel: Any, index: int) -> List[str]:
         """Validate a single channel object."""
         errors = []
+        append = errors.append
 
         if not isinstance(channel, dict):
-            errors.append(f"channels[{index}] must be a dictionary")
+            append(f"channels[{index}] must be a dictionary")
             return errors
 
         # Check required fields
         for field in self.REQUIRED_CHANNEL_FIELDS:
             if field not in channel:
-                errors.append(f"channels[{index}] missing required field: {field}")
+                append(f"channels[{index}] missing required field: {field}")
+
+        get = channel.get
 
         # Validate channel_id format
-        channel_id = channel.get("channel_id", "")
+        channel_id = get("channel_id", "")
         if not self._is_valid_channel_id(channel_id):
-            errors.append(f"channels[{index}].channel_id has invalid format: {channel_id}")
+            append(f"channels[{index}].channel_id has invalid format: {channel_id}")
 
         # Validate channel_name length
-        channel_name = channel.get("channel_name")
-        if channel_name and len(channel_name) > self.MAX_LENGTHS["channel_name"]:
-            errors.append(
-                f"channels[{index}].channel_name too long "
-                f"(max {self.MAX_LENGTHS['channel_name']} chars)"
-            )
+        channel_name = get("channel_name")
+        max_length = self.MAX_LENGTHS["channel_name"]
+        if channel_name and len(channel_name) > max_length:
+            append(f"channels[{index}].channel_name too long (max {max_length} chars)")
 
         return errors
 
     def _validate_video(self, video: Any, index: int) -> List[str]:
         """Validate a single video object."""
         errors = []
+        append = errors.append
 
         if not isinstance(video, dict):
-            errors.append(f"videos[{index}] must be a dictionary")
+            append(f"videos[{index}] must be a dictionary")
             return errors
 
         # Check required fields
         for field in self.REQUIRED_VIDEO_FIELDS:
             if field not in video:
-                errors.append(f"videos[{index}] missing required field: {field}")
+                append(f"videos[{index}] missing required field: {field}")
+
+        # Bound once: called for every field of every imported video
+        get = video.get
 
         # Validate video_id format
-        video_id = video.get("video_id", "")
+        video_id = get("video_id", "")
         if not self._is_valid_video_id(video_id):
-            errors.append(f"videos[{index}].video_id has invalid format: {video_id}")
+            append(f"videos[{index}].video_id has invalid format: {video_id}")
 
         # Validate processing_status
-        status = video.get("processing_status", "")
+        status = get("processing_status", "")
         if status not in self.VALID_PROCESSING_STATUSES:
-            errors.append(
+            append(
                 f"videos[{index}].processing_status invalid: {status}. "
                 f"Must be one of {self.VALID_PROCESSING_STATUSES}"
             )
 
         # Validate data types
-        duration = video.get("duration_seconds")
+        duration = get("duration_seconds")
         if duration is not None and not isinstance(duration, int):
-            errors.append(f"videos[{index}].duration_seconds must be integer, got {type(duration).__name__}")
+            append(f"videos[{index}].duration_seconds must be integer, got {type(duration).__name__}")
 
-        email_sent = video.get("email_sent")
+        email_sent = get("email_sent")
         if email_sent is not None and not isinstance(email_sent, bool):
-            errors.append(f"videos[{index}].email_sent must be boolean, got {type(email_sent).__name__}")
+            append(f"videos[{index}].email_sent must be boolean, got {type(email_sent).__name__}")
 
-        # Validate field lengths
-        title = video.get("title", "")
-        if len(title) > self.MAX_LENGTHS["title"]:
-            errors.append(
-                f"videos[{index}].title too long (max {self.MAX_LENGTHS['title']} chars)"
-            )
+        # Validate NOT NULL text fields (missing ones are reported above)
+        for field in ("channel_id", "title"):
+            if field in video and not isinstance(video[field], str):
+                append(f"videos[{index}].{field} must be string, got {type(video[field]).__name__}")
 
-        summary = video.get("summary_text")
-        if summary and len(summary) > self.MAX_LENGTHS["summary_text"]:
-            errors.append(
-                f"videos[{index}].summary_text too long (max {self.MAX_LENGTHS['summary_text']} chars)"
-            )
+        title = get("title")
+        max_length = self.MAX_LENGTHS["title"]
+        if isinstance(title, str) and len(title) > max_length:
+            append(f"videos[{index}].title too long (max {max_length} chars)")
 
-        error_msg = video.get("error_message")
-        if error_msg and len(error_msg) > self.MAX_LENGTHS["error_message"]:
-            errors.append(
-                f"videos[{index}].error_message too long (max {self.MAX_LENGTHS['error_message']} chars)"
-            )
+        # Validate optional field lengths
+        for field, max_length in self.VIDEO_LENGTH_LIMITS:
+            value = get(field)
+            if value and len(value) > max_length:
+                append(f"videos[{index}].{field} too long (max {max_length} chars)")
 
         return errors
 
@@ -588,25 +691,21 @@ class ImportManager:
 
     def _is_valid_channel_id(self, channel_id: str) -> bool:
         """Validate YouTube channel ID format."""
-        import re
-
         # Standard channel ID: UC + 22 alphanumeric/dash/underscore
-        if re.match(r"^UC[\w-]{22}$", channel_id):
+        if len(channel_id) == 24 and channel_id.startswith("UC") and _is_id_chars(channel_id):
             return True
 
         # Handle format: @username
-        if re.match(r"^@[\w-]+$", channel_id):
+        if len(channel_id) > 1 and channel_id.startswith("@") and _is_id_chars(channel_id[1:]):
             return True
 
         # Custom URL format
-        if re.match(r"^[\w-]+$", channel_id) and len(channel_id) > 3:
+        if len(channel_id) > 3 and _is_id_chars(channel_id):
             return True
 
         return False
 
     def _is_valid_video_id(self, video_id: str) -> bool:
         """Validate YouTube video ID format."""
-        import re
-
         # YouTube video IDs are 11 characters: alphanumeric, dash, underscore
-        return bool(re.match(r"^[\w-]{11}$", video_id))
+        return len(video_id) == 11 and _is_id_chars(video_id)
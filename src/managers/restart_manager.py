@@ -4,52 +4,72 @@ Restart Manager - Handles application restart for both Docker and Python modes
 """
 
 import os
+import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
 def detect_docker_compose_command():
     """
     Detect which Docker Compose command is available
     Returns: list with command parts, or None if not available
+
+    Cached for the process lifetime (callers must not mutate the list).
+    Binaries missing from PATH are skipped without spawning a subprocess.
     """
     # Try modern 'docker compose' first
-    try:
-        result = subprocess.run(
-            ['docker', 'compose', 'version'],
-            capture_output=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return ['docker', 'compose']
-    except:
-        pass
+    if shutil.which('docker') is not None:
+        try:
+            result = subprocess.run(
+                ['docker', 'compose', 'version'],
+                capture_output=True,
+                timeout=5
+            )
+            if result.returncode == 0:
+                return ['docker', 'compose']
+        except:
+            pass
 
     # Try legacy 'docker-compose'
-    try:
-        result = subprocess.run(
-            ['docker-compose', 'version'],
-            capture_output=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return ['docker-compose']
-    except:
-        pass
+    if shutil.which('docker-compose') is not None:
+        try:
+            result = subprocess.run(
+                ['docker-compose', 'version'],
+                capture_output=True,
+                timeout=5
+            )
+            if result.returncode == 0:
+                return ['docker-compose']
+        except:
+            pass
 
     return None
 
 
+@lru_cache(maxsize=1)
+def _has_container_marker():
+    """
+    Check for the Docker/Podman marker files (cached, they cannot appear or
+    disappear under a running process)
+    """
+    return os.path.exists('/.dockerenv') or os.path.exists('/run/.containerenv')
+
+
+@lru_cache(maxsize=1)
 def detect_runtime_environment():
     """
     Detect if running in Docker or native Python
     Returns: tuple ('docker'|'python', command_description)
 
+    Cached: the runtime environment cannot change while the process runs.
+
     NOTE: When we're INSIDE a Docker container, we restart the Python process.
     We only try to use docker-compose when running outside containers (native mode).
     """
     # Check if running in Docker container (most reliable check)
-    if os.path.exists('/.dockerenv') or os.path.exists('/run/.containerenv'):
+    if _has_container_marker():
         return ('python', 'restart_python_process')
 
     # Check if running inside a Docker container by checking cgroup
@@ -113,7 +133,7 @@ def restart_application():
             import sys
 
             # Check if we're inside Docker
-            in_docker = os.path.exists('/.dockerenv') or os.path.exists('/run/.containerenv')
+            in_docker = _has_container_marker()
 
             if in_docker:
                 # Exit with code 0 so Docker's restart policy kicks in
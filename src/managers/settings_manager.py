@@ -22,7 +22,7 @@ class SettingsManager:
     - Designed for single-user homeserver setups
     """
 
-    def __init__(self, env_path='.env', db_path='data/videos.db', lock_timeout=10):
+    def __init__(self, env_path='.env', db_path='data/videos.db', lock_timeout=10, db=None):
         """
         Initialize SettingsManager.
 
@@ -30,10 +30,13 @@ class SettingsManager:
             env_path: Unused, kept for backward compatibility
             db_path: Path to SQLite database
             lock_timeout: Unused, kept for backward compatibility
+            db: Optional existing VideoDatabase to share (db_path is then ignored)
         """
-        # Import here to avoid circular dependency
-        from src.managers.database import VideoDatabase
-        self.db = VideoDatabase(db_path)
+        if db is None:
+            # Import here to avoid circular dependency
+            from src.managers.database import VideoDatabase
+            db = VideoDatabase(db_path)
+        self.db = db
 
         # Define settings schema for validation
         self.env_schema = {
@@ -219,12 +222,13 @@ class SettingsManager:
         """
         return self.db.get_setting(key)
 
-    def get_all_settings(self, mask_secrets=True) -> Dict[str, Any]:
+    def get_all_settings(self, mask_secrets=True, db_settings: Optional[Dict[str, Dict[str, str]]] = None) -> Dict[str, Any]:
         """
         Get all settings from database with optional masking.
 
         Args:
             mask_secrets: If True, mask secret values for display
+            db_settings: Optional pre-read VideoDatabase.get_all_settings() result
 
         Returns:
             Dict with structure: { key: { value, masked, type, description, ... } }
@@ -233,7 +237,8 @@ class SettingsManager:
 
         try:
             # Get all settings from database (automatically decrypted)
-            db_settings = self.db.get_all_settings()
+            if db_settings is None:
+                db_settings = self.db.get_all_settings()
 
             # Process each defined setting
             for key, schema in self.env_schema.items():
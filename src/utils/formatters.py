@@ -3,10 +3,12 @@
 Formatting utilities for displaying data in human-readable formats
 Extracted from database.py for reusability
 """
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
 
+@lru_cache(maxsize=4096)
 def format_duration(seconds: Optional[int]) -> str:
     """
     Format duration in seconds to HH:MM:SS or MM:SS
@@ -30,6 +32,7 @@ def format_duration(seconds: Optional[int]) -> str:
         return f"{minutes}:{secs:02d}"
 
 
+@lru_cache(maxsize=4096)
 def format_views(views: Optional[int]) -> str:
     """
     Format view count to human-readable string
@@ -64,6 +67,13 @@ def format_upload_date(date_str: Optional[str]) -> str:
     if not date_str:
         return 'Unknown date'
 
+    # Result only changes with the calendar day, so cache per (date_str, today)
+    return _format_upload_date(date_str, datetime.now().date())
+
+
+@lru_cache(maxsize=4096)
+def _format_upload_date(date_str: str, today: date) -> str:
+    """Format a non-empty upload date relative to today (see format_upload_date)"""
     try:
         # Handle both YYYY-MM-DD and full ISO datetime formats
         if 'T' in date_str or ' ' in date_str:
@@ -72,8 +82,7 @@ def format_upload_date(date_str: Optional[str]) -> str:
             # Parse YYYY-MM-DD format
             dt = datetime.strptime(date_str, '%Y-%m-%d')
 
-        now = datetime.now()
-        days_ago = (now.date() - dt.date()).days
+        days_ago = (today - dt.date()).days
 
         # If today
         if days_ago == 0:
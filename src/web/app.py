@@ -10,11 +10,12 @@ import sys
 import logging
 import subprocess
 import signal
+import gzip
 import json
-import io
+from datetime import datetime
 from pathlib import Path
 from fastapi import FastAPI, HTTPException, File, UploadFile
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
@@ -49,7 +50,7 @@ from src.managers.config_manager import ConfigManager
 from src.managers.settings_manager import SettingsManager, test_openai_key, test_smtp_credentials
 from src.managers.database import VideoDatabase
 from src.managers.restart_manager import detect_runtime_environment, restart_application
-from src.managers.export_manager import ExportManager
+from src.managers.export_manager import ExportManager, MSGPACK_AVAILABLE
 from src.managers.import_manager import ImportManager
 from src.core.ytdlp_client import YTDLPClient
 from src.core.youtube import YouTubeClient
@@ -90,12 +91,12 @@ templates = Jinja2Templates(directory="src/templates")
 templates.env.auto_reload = True
 templates.env.cache = None
 
-# Initialize managers (all use database now!)
-config_manager = ConfigManager(db_path='data/videos.db')
-settings_manager = SettingsManager(db_path='data/videos.db')
+# Initialize managers (all use database now!), sharing one VideoDatabase
 video_db = VideoDatabase('data/videos.db')
-export_manager = ExportManager(db_path='data/videos.db')
-import_manager = ImportManager(db_path='data/videos.db')
+config_manager = ConfigManager(db=video_db)
+settings_manager = SettingsManager(db=video_db)
+export_manager = ExportManager(db=video_db)
+import_manager = ImportManager(db=video_db)
 ytdlp_client = YTDLPClient()
 youtube_client = YouTubeClient(use_ytdlp=True)
 
@@ -1540,52 +1541,138 @@ async def add_single_video(data: SingleVideoAdd):
 # EXPORT API ENDPOINTS
 # ============================================================================
 
+# Export type each /api/export/feed format is cached/ETagged under
+EXPORT_FEED_ETAG_TYPES = {"json": "feed_export", "csv": "videos", "msgpack": "feed_export_msgpack"}
+
+
+def _strip_weak_prefix(tag: str) -> str:
+    """Opaque part of an entity tag (If-None-Match uses weak comparison)."""
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an export ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {_strip_weak_prefix(tag) for tag in if_none_match.split(",")}
+    return "*" in tags or _strip_weak_prefix(etag) in tags
+
+
+def _accepts_gzip(request: Request) -> bool:
+    """
+    Whether the client prefers a gzip body, per the Accept-Encoding q-values.
+
+    gzip (or '*') must have q > 0, and at least the q-value of identity
+    (which is acceptable by default unless excluded).
+    """
+    qualities = {}
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding] = q
+
+    wildcard = qualities.get("*")
+    gzip_q = qualities.get("gzip", qualities.get("x-gzip", wildcard or 0.0))
+    identity_q = qualities.get("identity", wildcard if wildcard is not None else 1.0)
+    return gzip_q > 0 and gzip_q >= identity_q
+
+
+def _json_download_response(request: Request, json_bytes: bytes, filename: str, etag: str) -> Response:
+    """Build a JSON file download, gzip-compressed when the client accepts it."""
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+    }
+
+    # Summaries compress ~10x; tiny bodies are not worth the gzip header
+    if len(json_bytes) >= 1024 and _accepts_gzip(request):
+        json_bytes = gzip.compress(json_bytes, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(content=json_bytes, media_type="application/json", headers=headers)
+
+
 @app.get("/api/export/feed")
-async def export_feed(format: str = "json"):
+async def export_feed(request: Request, format: str = "json"):
     """
     Export Feed level data (channels + videos).
 
     Parameters:
-    - format: 'json' or 'csv' (default: 'json')
+    - format: 'json', 'csv' or 'msgpack' (default: 'json')
 
     Returns:
-    - StreamingResponse with downloadable export file
+    - Downloadable export file (JSON/MessagePack body or streamed CSV), or 304
+      if the If-None-Match ETag still matches the database
     """
     try:
-        if format not in ("json", "csv"):
+        if format not in EXPORT_FEED_ETAG_TYPES:
             raise HTTPException(
                 status_code=400,
-                detail="Invalid format parameter. Must be 'json' or 'csv'"
+                detail="Invalid format parameter. Must be 'json', 'csv' or 'msgpack'"
             )
+        if format == "msgpack" and not MSGPACK_AVAILABLE:
+            raise HTTPException(
+                status_code=400,
+                detail="MessagePack export requires the msgpack package"
+            )
+
+        # Unchanged database: skip the export entirely
+        etag = export_manager.export_etag(EXPORT_FEED_ETAG_TYPES[format])
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
 
         if format == "json":
             # Export Feed as JSON
             data = export_manager.export_feed_json()
-            filename = export_manager.generate_export_filename("feed_export", "json")
+            filename = export_manager.generate_export_filename(
+                "feed_export", "json", datetime.fromisoformat(data["export_timestamp"])
+            )
 
-            # Convert to JSON string (pretty-printed)
-            json_str = json.dumps(data, indent=2, ensure_ascii=False)
+            # Serialize to pretty-printed UTF-8 JSON (orjson when installed)
+            json_bytes = export_manager.to_json_bytes(data)
 
             # Return as downloadable file
-            return StreamingResponse(
-                io.BytesIO(json_str.encode('utf-8')),
-                media_type="application/json",
+            return _json_download_response(request, json_bytes, filename, etag)
+
+        elif format == "msgpack":
+            # Export Feed as MessagePack (already compact binary, no gzip)
+            msgpack_bytes = export_manager.export_feed_msgpack()
+            filename = export_manager.generate_export_filename("feed_export", "msgpack")
+
+            return Response(
+                content=msgpack_bytes,
+                media_type="application/x-msgpack",
                 headers={
-                    "Content-Disposition": f'attachment; filename="{filename}"'
+                    "Content-Disposition": f'attachment; filename="{filename}"',
+                    "ETag": etag,
                 }
             )
 
         else:  # format == "csv"
-            # Export videos as CSV
-            csv_content = export_manager.export_videos_csv()
+            # Export videos as CSV, streamed chunk by chunk (chunks already start with the BOM)
+            csv_chunks = export_manager.iter_videos_csv()
             filename = export_manager.generate_export_filename("videos", "csv")
 
             # Return as downloadable file
             return StreamingResponse(
-                io.BytesIO(csv_content.encode('utf-8-sig')),
+                (chunk.encode('utf-8') for chunk in csv_chunks),
                 media_type="text/csv",
                 headers={
-                    "Content-Disposition": f'attachment; filename="{filename}"'
+                    "Content-Disposition": f'attachment; filename="{filename}"',
+                    "ETag": etag,
                 }
             )
 
@@ -1600,29 +1687,31 @@ async def export_feed(format: str = "json"):
 
 
 @app.get("/api/export/backup")
-async def export_backup():
+async def export_backup(request: Request):
     """
     Export Complete Backup (channels + videos + settings + AI prompt).
 
     Returns:
-    - StreamingResponse with downloadable JSON backup file
+    - Response with downloadable JSON backup file, or 304 if the
+      If-None-Match ETag still matches the database
     """
     try:
+        # Unchanged database: skip the export entirely
+        etag = export_manager.export_etag("full_backup")
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
         # Export Complete Backup
         data = export_manager.export_complete_backup_json()
-        filename = export_manager.generate_export_filename("full_backup", "json")
+        filename = export_manager.generate_export_filename(
+            "full_backup", "json", datetime.fromisoformat(data["export_timestamp"])
+        )
 
-        # Convert to JSON string (pretty-printed)
-        json_str = json.dumps(data, indent=2, ensure_ascii=False)
+        # Serialize to pretty-printed UTF-8 JSON (orjson when installed)
+        json_bytes = export_manager.to_json_bytes(data)
 
         # Return as downloadable file
-        return StreamingResponse(
-            io.BytesIO(json_str.encode('utf-8')),
-            media_type="application/json",
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"'
-            }
-        )
+        return _json_download_response(request, json_bytes, filename, etag)
 
     except Exception as e:
         logger.error(f"Export backup failed: {e}")
@@ -1678,7 +1767,7 @@ async def validate_import(file: UploadFile = File(...)):
 
         # Parse JSON
         try:
-            data = json.loads(content.decode('utf-8'))
+            data = import_manager.parse_json(content)
         except json.JSONDecodeError as e:
             return JSONResponse(
                 status_code=200,
@@ -1691,7 +1780,9 @@ async def validate_import(file: UploadFile = File(...)):
             )
 
         # Validate file structure
-        validation_result = import_manager.validate_import_file(data)
+        validation_result = import_manager.validate_import_file(
+            data, cache_key=import_manager.content_key(content)
+        )
 
         if not validation_result.valid:
             return JSONResponse(
@@ -1705,7 +1796,7 @@ async def validate_import(file: UploadFile = File(...)):
             )
 
         # Generate preview
-        preview = import_manager.preview_import(data)
+        preview = import_manager.preview_import(data, size_bytes=len(content))
 
         return JSONResponse(
             status_code=200,
@@ -1769,7 +1860,7 @@ async def execute_import(file: UploadFile = File(...)):
 
         # Parse JSON
         try:
-            data = json.loads(content.decode('utf-8'))
+            data = import_manager.parse_json(content)
         except json.JSONDecodeError as e:
             raise HTTPException(
                 status_code=400,
@@ -1777,7 +1868,9 @@ async def execute_import(file: UploadFile = File(...)):
             )
 
         # Validate before import
-        validation_result = import_manager.validate_import_file(data)
+        validation_result = import_manager.validate_import_file(
+            data, cache_key=import_manager.content_key(content)
+        )
         if not validation_result.valid:
             raise HTTPException(
                 status_code=400,